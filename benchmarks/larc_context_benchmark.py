@@ -0,0 +1,84 @@
+import asyncio
+import os
+import random
+import time
+from typing import List
+
+USERS = 10000
+MESSAGES = 10000
+CHANGED = 100
+
+# the whole message load stays in memory and nothing is spilled to disk
+os.environ['LARC_MESSAGES_HISTORY_SIZE'] = str(MESSAGES)
+os.environ['LARC_MESSAGES_SPILL_PATH'] = ''
+
+from context.larc_context import LarcContext
+from model.larc_models import LarcUser, LarcPlayer, LarcPlayerStatus, LarcReceivedMessage
+
+
+def _users(victories_offset: int = 0) -> List[LarcUser]:
+    users = [LarcUser(id_=i, name=f'user_{i}', victories=i % 7) for i in range(1, USERS + 1)]
+    for user in random.Random(victories_offset).sample(users, victories_offset):
+        user.victories += 1
+    random.Random(0).shuffle(users)
+    return users
+
+
+def _linear_get_user_by_id(users: List[LarcUser], user_id: int) -> LarcUser:
+    for user in users:
+        if user.id_ == user_id:
+            return user
+
+
+def _frame_lookups(context: LarcContext, lookup) -> float:
+    started = time.perf_counter()
+    for player in context.iter_players():
+        lookup(player.user_id)
+    for message in context.messages:
+        lookup(message.user_id)
+    return time.perf_counter() - started
+
+
+async def main():
+    context = LarcContext()
+    # the users task gets the same tuple back from its parser while the GET USERS payload is byte-identical
+    polled = tuple(_users())
+    await context.set_users(polled)
+    await context.set_players([LarcPlayer(user_id=i, status=LarcPlayerStatus.IDLE) for i in range(1, USERS + 1, 10)])
+    for i in range(MESSAGES):
+        await context.append_message(LarcReceivedMessage(user_id=random.randint(1, USERS), data=f'message {i}'))
+
+    users = context.users
+    # the legacy scan is timed on a sample and scaled, a full frame would take minutes
+    sample = 200
+    started = time.perf_counter()
+    for message in context.messages[:sample]:
+        _linear_get_user_by_id(users, message.user_id)
+    lookups = len(context.players) + len(context.messages)
+    linear = (time.perf_counter() - started) / sample * lookups
+    indexed = _frame_lookups(context, context.get_user_by_id)
+
+    print(f'{USERS} users, {len(context.players)} players, {MESSAGES} messages ({lookups} lookups per frame)')
+    print(f'  linear scan  {linear * 1000:>10.1f} ms/frame (estimated)')
+    print(f'  dict index   {indexed * 1000:>10.1f} ms/frame')
+
+    scenarios = (
+        ('identical payload', polled),
+        ('unchanged snapshot', _users()),
+        (f'{CHANGED} users updated', _users(CHANGED)),
+    )
+    for name, snapshot in scenarios:
+        started = time.perf_counter()
+        diff = await context.set_users(snapshot)
+        elapsed = time.perf_counter() - started
+        changes = 0 if diff is None else len(diff.added) + len(diff.removed) + len(diff.updated)
+        print(f'  set_users ({name:<18}) {elapsed * 1000:>8.1f} ms, {changes} changed ids')
+
+    legacy = _users(CHANGED)
+    started = time.perf_counter()
+    legacy.sort(key=lambda user: user.id_)
+    print(f'  legacy sort (always, plus event)    {(time.perf_counter() - started) * 1000:>8.1f} ms')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,170 @@
+import asyncio
+import curses
+import fcntl
+import json
+import os
+import pty
+import select
+import statistics
+import struct
+import tempfile
+import termios
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.larc_simulator import LarcSimulator
+from connection.larc_connection import LarcConnection
+from connection.larc_messages import LarcCredentials, LarcGetUsers, LarcGetPlayers, LarcGetMessage, LarcGetCard, \
+    LarcSendMessage, LarcEnterGame, LarcMessage
+
+LATENCY = 0.001
+CONCURRENCY = 8
+DURATION = 2
+UI_DURATION = 5
+UI_LINES, UI_COLUMNS = 40, 240
+UI_KEYS = (b'\x1b[5~', b'\x1b[6~')
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    if len(values) == 0:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percentile))]
+
+
+async def _closed_loop(connection: LarcConnection, build: Callable[[], LarcMessage]) -> Dict:
+    loop = asyncio.get_running_loop()
+    latencies: List[float] = []
+    deadline = loop.time() + DURATION
+
+    async def worker():
+        message = build()
+        while loop.time() < deadline:
+            started = time.perf_counter()
+            await message.execute()
+            latencies.append(time.perf_counter() - started)
+            if message.protocol.name == 'UDP':
+                # datagrams are fire and forget, let the simulator catch up instead of flooding its socket buffer
+                message = build()
+                await asyncio.sleep(0)
+
+    started = loop.time()
+    await asyncio.gather(*[worker() for _ in range(CONCURRENCY)])
+    elapsed = loop.time() - started
+    return {
+        'requests_per_s': len(latencies) / elapsed,
+        'p50': _percentile(latencies, 0.5),
+        'p99': _percentile(latencies, 0.99),
+    }
+
+
+async def _messages_benchmark(simulator: LarcSimulator):
+    connection = simulator.connection()
+    credentials = LarcCredentials(user_id=1, user_password='secret')
+    await LarcEnterGame(connection=connection, credentials=credentials).execute()
+    await asyncio.sleep(0.05)
+
+    scenarios = (
+        (LarcGetUsers, lambda: LarcGetUsers(connection=connection, credentials=credentials)),
+        (LarcGetPlayers, lambda: LarcGetPlayers(connection=connection, credentials=credentials)),
+        (LarcGetMessage, lambda: LarcGetMessage(connection=connection, credentials=credentials)),
+        (LarcGetCard, lambda: LarcGetCard(connection=connection, credentials=credentials)),
+        (LarcSendMessage, lambda: LarcSendMessage(
+            connection=connection, credentials=credentials, user_dest_id=2, message_data='hello there')),
+        (LarcEnterGame, lambda: LarcEnterGame(connection=connection, credentials=credentials)),
+    )
+    print(f'messages: {CONCURRENCY} concurrent callers, {LATENCY * 1000:.1f} ms simulated latency, '
+          f'pipelining {connection.pipelining}')
+    for cls, build in scenarios:
+        result = await _closed_loop(connection, build)
+        print(f'  {cls.__name__:<16} {result["requests_per_s"]:>10.0f} req/s'
+              f'  p50 {result["p50"] * 1000:>7.3f} ms  p99 {result["p99"] * 1000:>7.3f} ms')
+    await connection.close()
+
+
+def _ui_child(simulator: LarcSimulator, result_path: str):
+    from session.larc_session import LarcSession
+    from tasks.larc_poll_scheduler import LarcPollScheduler
+    from ui.menu_ui import MenuUI
+
+    fcntl.ioctl(0, termios.TIOCSWINSZ, struct.pack('HHHH', UI_LINES, UI_COLUMNS, 0, 0))
+
+    async def run():
+        session = LarcSession(
+            credentials=LarcCredentials(user_id=1, user_password='secret'),
+            connection=LarcConnection(address=simulator.host, tcp_port=simulator.tcp_port, udp_port=simulator.udp_port),
+            spill_path=None,
+        )
+        scheduler = LarcPollScheduler()
+        session.attach(scheduler)
+        scheduler.start()
+
+        menu = MenuUI(context=session.context)
+        try:
+            await asyncio.wait_for(menu.show(), UI_DURATION)
+        except asyncio.TimeoutError:
+            pass
+        curses.endwin()
+        with open(result_path, 'w') as result:
+            json.dump({
+                'frames': menu.render_scheduler.frames,
+                'frame_times': menu.render_scheduler.frame_times,
+                'messages': len(session.context.message_history),
+            }, result)
+
+    try:
+        asyncio.run(run())
+    finally:
+        os._exit(0)
+
+
+def _ui_benchmark(simulator: LarcSimulator):
+    with tempfile.NamedTemporaryFile(suffix='.json') as result_file:
+        os.environ['TERM'] = os.environ.get('TERM') or 'xterm-256color'
+        pid, master = pty.fork()
+        if pid == 0:
+            _ui_child(simulator, result_file.name)
+
+        # the terminal output is drained and thrown away, scrolling keys keep the message panel busy
+        written = 0
+        deadline = time.monotonic() + UI_DURATION + 5
+        next_key = time.monotonic() + 1
+        keys = 0
+        while time.monotonic() < deadline:
+            readable, _, _ = select.select([master], [], [], 0.1)
+            if master in readable:
+                try:
+                    data = os.read(master, 65536)
+                except OSError:
+                    break
+                if len(data) == 0:
+                    break
+                written += len(data)
+            if time.monotonic() >= next_key:
+                os.write(master, UI_KEYS[keys % len(UI_KEYS)])
+                keys += 1
+                next_key += 0.25
+        os.waitpid(pid, 0)
+        os.close(master)
+
+        with open(result_file.name) as result:
+            stats = json.load(result)
+
+    frame_times = stats['frame_times']
+    print(f'MenuUI: {UI_DURATION}s, {UI_LINES}x{UI_COLUMNS} terminal, {stats["messages"]} messages received')
+    print(f'  {stats["frames"]} frames ({stats["frames"] / UI_DURATION:.1f} fps), {written / 1024:.1f} KiB written')
+    if len(frame_times) > 0:
+        print(f'  frame time p50 {_percentile(frame_times, 0.5) * 1000:.3f} ms'
+              f'  p99 {_percentile(frame_times, 0.99) * 1000:.3f} ms'
+              f'  mean {statistics.mean(frame_times) * 1000:.3f} ms')
+
+
+def main():
+    with LarcSimulator(users=200, players=50, latency=LATENCY) as simulator:
+        asyncio.run(_messages_benchmark(simulator))
+    with LarcSimulator(users=200, players=50, latency=LATENCY, message_rate=20) as simulator:
+        _ui_benchmark(simulator)
+
+
+if __name__ == '__main__':
+    main()
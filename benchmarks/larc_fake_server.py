@@ -0,0 +1,36 @@
+import socket
+import socketserver
+import threading
+from typing import Callable
+
+
+class LarcFakeServer:
+
+    def __init__(self, responder: Callable[[bytes], bytes], host: str = '127.0.0.1', port: int = 0):
+        responder_ = responder
+
+        class Handler(socketserver.StreamRequestHandler):
+
+            def handle(self):
+                for line in self.rfile:
+                    self.wfile.write(responder_(line.rstrip(b'\r\n')) + b'\r\n')
+                    self.wfile.flush()
+
+        self._server = socketserver.ThreadingTCPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def address(self):
+        return self._server.server_address
+
+    def connect(self) -> socket.socket:
+        return socket.create_connection(self.address)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,78 @@
+import socket
+import time
+
+from benchmarks.larc_fake_server import LarcFakeServer
+from config import LARC_TCP_READ_CHUNK_SIZE
+from connection.larc_framing import LarcFrameBuffer
+
+REQUEST = b'GET USERS 1:x\r\n'
+
+
+class _CountingSocket:
+
+    def __init__(self, sock: socket.socket):
+        self._sock = sock
+        self.recv_calls = 0
+
+    def sendall(self, data):
+        self._sock.sendall(data)
+
+    def recv(self, size):
+        self.recv_calls += 1
+        return self._sock.recv(size)
+
+    def recv_into(self, buffer):
+        self.recv_calls += 1
+        return self._sock.recv_into(buffer)
+
+
+def _legacy_response(sock: _CountingSocket) -> bytes:
+    buff: bytes = b''
+    while not buff.endswith(b'\r\n'):
+        buff += sock.recv(1)
+    return buff[:-2]
+
+
+def _framed_response(sock: _CountingSocket, frames: LarcFrameBuffer, chunk: memoryview) -> bytes:
+    frame = frames.next_frame()
+    while frame is None:
+        size = sock.recv_into(chunk)
+        frames.feed(chunk[:size])
+        frame = frames.next_frame()
+    return frame
+
+
+def _run(server: LarcFakeServer, requests: int, read_response) -> dict:
+    sock = _CountingSocket(server.connect())
+    started = time.perf_counter()
+    received = 0
+    for _ in range(requests):
+        sock.sendall(REQUEST)
+        received += len(read_response(sock))
+    elapsed = time.perf_counter() - started
+    return {
+        'recv_per_response': sock.recv_calls / requests,
+        'responses_per_s': requests / elapsed,
+        'mb_per_s': received / elapsed / 1024 / 1024,
+    }
+
+
+def main():
+    for users in (10, 100, 1000):
+        payload = b':'.join(b'%d:user_%d:%d' % (i, i, i % 7) for i in range(users))
+        requests = max(5, 20000 // users)
+        with LarcFakeServer(lambda _: payload) as server:
+            legacy = _run(server, requests, _legacy_response)
+
+            frames = LarcFrameBuffer()
+            chunk = memoryview(bytearray(LARC_TCP_READ_CHUNK_SIZE))
+            framed = _run(server, requests, lambda sock: _framed_response(sock, frames, chunk))
+
+        print(f'{users} users ({len(payload)} bytes/response, {requests} requests)')
+        for name, result in (('recv(1) loop', legacy), ('frame buffer', framed)):
+            print(f'  {name:<13} {result["recv_per_response"]:>10.1f} recv/response'
+                  f' {result["responses_per_s"]:>10.1f} responses/s {result["mb_per_s"]:>8.2f} MB/s')
+
+
+if __name__ == '__main__':
+    main()
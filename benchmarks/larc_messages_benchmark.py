@@ -0,0 +1,40 @@
+import time
+
+from config import LARC_ENCODING
+from connection.larc_messages import LarcCredentials, LarcGetUsers, LarcSendMessage
+
+REQUESTS = 100000
+
+
+def _legacy_for_socket(code: str, credentials: LarcCredentials, args) -> bytes:
+    args = list(map(lambda x: f'{x}', args))
+    fields = [str(credentials.user_id), credentials.user_password]
+    fields.extend(args)
+    return str.encode(f'{code} {":".join(fields)}\r\n', encoding=LARC_ENCODING)
+
+
+def _time(serialize) -> float:
+    started = time.perf_counter()
+    for idx in range(REQUESTS):
+        serialize(idx)
+    return (time.perf_counter() - started) / REQUESTS * 1000 * 1000
+
+
+def main():
+    credentials = LarcCredentials(user_id=8638, user_password='hwquw')
+    get_users = LarcGetUsers(connection=object(), credentials=credentials)
+    send_message = LarcSendMessage(connection=object(), credentials=credentials, user_dest_id=5, message_data='hello there')
+    scenarios = (
+        ('GET USERS  legacy', lambda idx: _legacy_for_socket('GET USERS', credentials, [])),
+        ('GET USERS  new object per poll',
+         lambda idx: LarcGetUsers(connection=object(), credentials=credentials).for_socket),
+        ('GET USERS  reused object', lambda idx: get_users.for_socket),
+        ('SEND MESSAGE legacy', lambda idx: _legacy_for_socket('SEND MESSAGE', credentials, [idx % 50, 'hello there'])),
+        ('SEND MESSAGE cached prefix', lambda idx: send_message._encode()),
+    )
+    for name, serialize in scenarios:
+        print(f'  {name:<32} {_time(serialize):>6.2f} us/request')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+import enum
+import gc
+import tracemalloc
+from array import array
+from typing import Callable, Iterable, Tuple
+
+from config import LARC_ENCODING
+from model.larc_models import LarcUser, LarcPlayer, LarcPlayerStatus
+
+ENTRIES = 100000
+
+
+class _LegacyUser:
+
+    def __init__(self, id_: int, name: str, victories: int):
+        self.id_: int = id_
+        self.name: str = name
+        self.victories: int = victories
+
+
+class _LegacyPlayerStatus(enum.Enum):
+    IDLE = 'IDLE'
+    PLAYING = 'PLAYING'
+    GETTING = 'GETTING'
+    WAITING = 'WAITING'
+
+
+class _LegacyPlayer:
+
+    def __init__(self, user_id: int, status: _LegacyPlayerStatus):
+        self.user_id = user_id
+        self.status = status
+
+
+def _user_table(users: Iterable[LarcUser]) -> Tuple[array, array, bytes, array]:
+    # columnar layout: ids and victories as arrays, every name in one blob, name i spans offsets[i]:offsets[i + 1]
+    ids, victories, offsets = array('q'), array('q'), array('L', [0])
+    names = bytearray()
+    for user in users:
+        ids.append(user.id_)
+        victories.append(user.victories)
+        names += user.name.encode(LARC_ENCODING)
+        offsets.append(len(names))
+    return ids, victories, bytes(names), offsets
+
+
+def _player_table(players: Iterable[LarcPlayer]) -> Tuple[array, array]:
+    user_ids, statuses = array('q'), array('b')
+    for player in players:
+        user_ids.append(player.user_id)
+        statuses.append(player.status)
+    return user_ids, statuses
+
+
+def _measure(build: Callable) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return after - before
+
+
+def _users(cls):
+    return [cls(id_=i, name=f'user_{i}', victories=i % 7) for i in range(ENTRIES)]
+
+
+def _players(cls, statuses):
+    return [cls(user_id=i, status=statuses[i % 4]) for i in range(ENTRIES)]
+
+
+def main():
+    legacy_statuses = list(_LegacyPlayerStatus)
+    statuses = list(LarcPlayerStatus)
+    scenarios = (
+        ('users   legacy objects', lambda: _users(_LegacyUser)),
+        ('users   slotted objects', lambda: _users(LarcUser)),
+        ('users   columnar table', lambda: _user_table(
+            LarcUser(id_=i, name=f'user_{i}', victories=i % 7) for i in range(ENTRIES))),
+        ('players legacy objects', lambda: _players(_LegacyPlayer, legacy_statuses)),
+        ('players slotted objects', lambda: _players(LarcPlayer, statuses)),
+        ('players columnar table', lambda: _player_table(
+            LarcPlayer(user_id=i, status=statuses[i % 4]) for i in range(ENTRIES))),
+    )
+    print(f'{ENTRIES} entries')
+    for name, build in scenarios:
+        allocated = _measure(build)
+        print(f'  {name:<24} {allocated / 1024 / 1024:>7.2f} MiB  {allocated / ENTRIES:>6.1f} bytes/entry')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+import time
+from typing import List
+
+from config import LARC_ENCODING
+from connection.larc_messages import _build_user, _build_player
+from connection.larc_parsers import LarcRecordParser
+from model.larc_models import LarcUser, LarcPlayer, LarcPlayerStatus
+
+ROUNDS = 5
+
+
+def _legacy_users(response: bytes) -> List[LarcUser]:
+    users = []
+    if response is not None and len(response) > 0:
+        parts = response.decode(LARC_ENCODING).split(':')
+        for i in range(2, len(parts), 3):
+            users.append(LarcUser(id_=int(parts[i - 2]), name=parts[i - 1], victories=int(parts[i])))
+    return users
+
+
+def _legacy_players(response: bytes) -> List[LarcPlayer]:
+    players = []
+    if response is not None and len(response) > 0:
+        parts = response.decode(LARC_ENCODING).split(':')
+        for i in range(1, len(parts), 2):
+            players.append(LarcPlayer(user_id=int(parts[i - 1]), status=LarcPlayerStatus[parts[i]]))
+    return players
+
+
+def _users_payload(entries: int, changed: int = 0) -> bytes:
+    return b':'.join(b'%d:user_%d:%d' % (i, i, i % 7 + (1 if i < changed else 0)) for i in range(entries))
+
+
+def _players_payload(entries: int, changed: int = 0) -> bytes:
+    statuses = [b'IDLE', b'PLAYING', b'GETTING', b'WAITING']
+    return b':'.join(b'%d:%s' % (i, statuses[(i + (1 if i < changed else 0)) % 4]) for i in range(entries))
+
+
+def _time(parse, payloads: List[bytes]) -> float:
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        for payload in payloads:
+            parse(payload)
+    return (time.perf_counter() - started) / ROUNDS / len(payloads) * 1000
+
+
+def main():
+    parsers = (
+        ('GET USERS', _legacy_users, LarcRecordParser(fields=3, build=_build_user).parse, _users_payload),
+        ('GET PLAYERS', _legacy_players, LarcRecordParser(fields=2, build=_build_player).parse, _players_payload),
+    )
+    for name, legacy, fast, payload in parsers:
+        print(name)
+        for entries in (1000, 10000, 100000):
+            base = payload(entries)
+            scenarios = (
+                ('unchanged', [base]),
+                ('1% changed', [payload(entries, entries // 100), base]),
+                ('all new', [payload(entries + i) for i in range(1, 3)]),
+            )
+            for scenario, payloads in scenarios:
+                fast(base)
+                legacy_ms = _time(legacy, payloads)
+                fast_ms = _time(fast, payloads)
+                print(f'  {entries:>6} entries {scenario:<10}  legacy {legacy_ms:>8.2f} ms'
+                      f'  fast path {fast_ms:>8.2f} ms  ({legacy_ms / fast_ms:>5.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
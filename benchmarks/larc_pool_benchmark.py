@@ -0,0 +1,77 @@
+import asyncio
+import time
+from typing import List
+
+from benchmarks.larc_simulator import LarcSimulator
+from connection.larc_connection import LarcConnection
+from connection.larc_messages import LarcCredentials, LarcGetUsers, LarcGetCard, LarcEnterGame
+
+LATENCY = 0.02
+BACKGROUND_CALLERS = 32
+CARDS = 50
+POOLS = ((1, 0), (2, 1), (4, 1))
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percentile))]
+
+
+async def _run(simulator: LarcSimulator, size: int, reserved: int) -> dict:
+    connection = LarcConnection(
+        address=simulator.host,
+        tcp_port=simulator.tcp_port,
+        udp_port=simulator.udp_port,
+        pool_size=size,
+        pool_reserved=reserved,
+    )
+    credentials = LarcCredentials(user_id=1, user_password='secret')
+    await LarcEnterGame(connection=connection, credentials=credentials).execute()
+    stopped = False
+    polls = 0
+
+    async def background():
+        nonlocal polls
+        get_users = LarcGetUsers(connection=connection, credentials=credentials)
+        while not stopped:
+            await get_users.execute()
+            polls += 1
+
+    workers = [asyncio.ensure_future(background()) for _ in range(BACKGROUND_CALLERS)]
+    await asyncio.sleep(0.2)
+
+    get_card = LarcGetCard(connection=connection, credentials=credentials)
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(CARDS):
+        requested = time.perf_counter()
+        await get_card.execute()
+        latencies.append(time.perf_counter() - requested)
+    elapsed = time.perf_counter() - started
+
+    stopped = True
+    await asyncio.gather(*workers)
+    stats = connection.pool_stats
+    await connection.close()
+    return {
+        'p50': _percentile(latencies, 0.5),
+        'p99': _percentile(latencies, 0.99),
+        'polls_per_s': polls / (elapsed + 0.2),
+        'stats': stats,
+    }
+
+
+def main():
+    print(f'GET CARD while {BACKGROUND_CALLERS} callers poll GET USERS, {LATENCY * 1000:.0f} ms simulated latency')
+    with LarcSimulator(users=200, latency=LATENCY) as simulator:
+        for size, reserved in POOLS:
+            result = asyncio.run(_run(simulator, size, reserved))
+            stats = result['stats']
+            print(f'  pool {size} reserved {reserved}  GET CARD p50 {result["p50"] * 1000:>6.1f} ms'
+                  f'  p99 {result["p99"] * 1000:>6.1f} ms  GET USERS {result["polls_per_s"]:>6.0f}/s'
+                  f'  {stats.connects} connects ({stats.max_connect_time * 1000:.2f} ms max)'
+                  f'  {stats.waits} waits, {stats.max_waiters} max waiters')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+from benchmarks.larc_simulator import LarcSimulator
+from connection.larc_messages import LarcCredentials, LarcGetUsers, LarcGetPlayers
+
+LATENCY = 0.005
+CALLERS = 8
+DURATION = 5
+DROP_INTERVAL = 0.5
+
+
+async def _run(simulator: LarcSimulator) -> dict:
+    connection = simulator.connection()
+    credentials = LarcCredentials(user_id=1, user_password='secret')
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + DURATION
+    succeeded, failed = 0, 0
+
+    async def caller(message):
+        nonlocal succeeded, failed
+        while loop.time() < deadline:
+            try:
+                await message.execute()
+                succeeded += 1
+            except ConnectionError:
+                failed += 1
+
+    async def dropper():
+        drops = 0
+        while loop.time() < deadline - DROP_INTERVAL:
+            await asyncio.sleep(DROP_INTERVAL)
+            simulator.drop_connections()
+            drops += 1
+        return drops
+
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        dropper(),
+        *[caller(LarcGetUsers(connection=connection, credentials=credentials)) for _ in range(CALLERS // 2)],
+        *[caller(LarcGetPlayers(connection=connection, credentials=credentials)) for _ in range(CALLERS // 2)],
+    )
+    elapsed = time.perf_counter() - started
+    stats = connection.pool_stats
+    await connection.close()
+    return {
+        'drops': results[0],
+        'succeeded': succeeded,
+        'failed': failed,
+        'requests_per_s': succeeded / elapsed,
+        'stats': stats,
+    }
+
+
+def main():
+    with LarcSimulator(users=200, latency=LATENCY) as simulator:
+        result = asyncio.run(_run(simulator))
+    stats = result['stats']
+    print(f'{CALLERS} callers polling GET USERS / GET PLAYERS for {DURATION}s, '
+          f'server drops every connection every {DROP_INTERVAL}s')
+    print(f'  {result["drops"]} drops  {result["succeeded"]} requests succeeded ({result["requests_per_s"]:.0f}/s)'
+          f'  {result["failed"]} failed  {stats.replays} replayed  {stats.connects} connects'
+          f'  (connect p-max {stats.max_connect_time * 1000:.2f} ms)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+import asyncio
+import os
+import time
+import tracemalloc
+
+from benchmarks.larc_simulator import LarcSimulator
+from connection.larc_messages import LarcCredentials
+from session.larc_session import LarcSession
+from tasks.larc_poll_scheduler import LarcPollScheduler
+
+SESSIONS = (1, 50, 200)
+DURATION = 5
+
+
+def _rss() -> int:
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+async def _run(simulator: LarcSimulator, sessions_count: int) -> dict:
+    scheduler = LarcPollScheduler()
+    scheduler.start()
+
+    tracemalloc.start()
+    rss_before = _rss()
+    sessions = []
+    for user_id in range(1, sessions_count + 1):
+        session = LarcSession(
+            credentials=LarcCredentials(user_id=user_id, user_password='secret'),
+            connection=simulator.connection(),
+            spill_path=None,
+        )
+        session.attach(scheduler)
+        sessions.append(session)
+
+    cpu_before = time.process_time()
+    await asyncio.sleep(DURATION)
+    cpu = time.process_time() - cpu_before
+    allocated = tracemalloc.get_traced_memory()[0]
+    rss = _rss() - rss_before
+    tracemalloc.stop()
+
+    scheduler.stop()
+    for session in sessions:
+        await session.close()
+    return {
+        'allocated': allocated / sessions_count,
+        'rss': rss / sessions_count,
+        'cpu': cpu / DURATION / sessions_count * 100,
+        'users': sum(len(session.context.users) for session in sessions) / sessions_count,
+    }
+
+
+def main():
+    print(f'process baseline RSS {_rss() / 1024 / 1024:.1f} MiB (the cost of one process per account)')
+    # the simulator runs in this process, so its share is included in the traced memory and the CPU time
+    with LarcSimulator(users=max(SESSIONS), players=10, message_rate=1) as simulator:
+        for sessions_count in SESSIONS:
+            result = asyncio.run(_run(simulator, sessions_count))
+            print(f'  {sessions_count:>4} sessions  {result["allocated"] / 1024:>7.1f} KiB traced/session'
+                  f'  {result["rss"] / 1024:>7.1f} KiB RSS/session  {result["cpu"]:>6.3f}% CPU/session'
+                  f'  {result["users"]:.0f} users seen')
+
+
+if __name__ == '__main__':
+    main()
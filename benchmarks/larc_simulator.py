@@ -0,0 +1,347 @@
+import argparse
+import asyncio
+import random
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from config import LARC_ENCODING, LARC_TCP_PIPELINING
+from connection.larc_connection import LarcConnection
+from model.larc_models import LarcCardSuit, LarcPlayerStatus
+
+LARC_INVALID_USER = 'Usuário inválido!'.encode(LARC_ENCODING)
+LARC_CARD_VALUES = ('A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K')
+
+
+class _LarcSimulatorDatagramProtocol(asyncio.DatagramProtocol):
+
+    def __init__(self, simulator: 'LarcSimulator'):
+        self._simulator = simulator
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self._simulator.respond(data.rstrip(b'\r\n'))
+
+
+class LarcSimulator:
+    # generated messages are delivered in ticks of this size
+    _MESSAGE_TICK = 0.05
+
+    def __init__(
+            self,
+            users: int = 50,
+            players: int = 10,
+            latency: float = 0.0,
+            jitter: float = 0.0,
+            message_rate: float = 0.0,
+            message_size: int = 32,
+            name_size: int = 8,
+            inbox_size: int = 1000,
+            passwords: Dict[int, str] = None,
+            host: str = '127.0.0.1',
+            tcp_port: int = 0,
+            udp_port: int = 0,
+            seed: int = 0,
+    ):
+        self._latency = latency
+        self._jitter = jitter
+        self._message_rate = message_rate
+        self._message_size = max(1, message_size)
+        self._name_size = name_size
+        self._inbox_size = inbox_size
+        self._passwords = passwords
+        self._host = host
+        self._tcp_port = tcp_port
+        self._udp_port = udp_port
+        self._random = random.Random(seed)
+
+        self._users: Dict[int, List] = {}
+        for user_id in range(1, users + 1):
+            self._add_user(user_id)
+        statuses = [status.name for status in LarcPlayerStatus]
+        self._players: Dict[int, str] = {
+            user_id: statuses[user_id % len(statuses)] for user_id in range(1, min(players, users) + 1)
+        }
+        self._inboxes: Dict[int, Deque[Tuple[int, str]]] = {}
+        self._users_payload: bytes = None
+        self._players_payload: bytes = None
+        self._sent_messages = 0
+        self._requests: Dict[str, int] = {}
+
+        self._loop: asyncio.AbstractEventLoop = None
+        self._thread: threading.Thread = None
+        self._ready = threading.Event()
+        self._stopping: asyncio.Event = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self._handlers: Set[asyncio.Task] = set()
+
+    @property
+    def host(self) -> str:
+        return self._host
+
+    @property
+    def tcp_port(self) -> int:
+        return self._tcp_port
+
+    @property
+    def udp_port(self) -> int:
+        return self._udp_port
+
+    @property
+    def latency(self) -> float:
+        return self._latency
+
+    @latency.setter
+    def latency(self, value: float) -> None:
+        # applies to the requests received from now on
+        self._latency = value
+
+    @property
+    def requests(self) -> Dict[str, int]:
+        return dict(self._requests)
+
+    def connection(self, pipelining: bool = LARC_TCP_PIPELINING) -> LarcConnection:
+        return LarcConnection(
+            pipelining=pipelining,
+            address=self._host,
+            tcp_port=self._tcp_port,
+            udp_port=self._udp_port,
+        )
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name='larc-simulator', daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._stopping.set)
+        self._thread.join()
+        self._thread = None
+
+    def drop_connections(self) -> None:
+        # every open TCP connection is cut, as if the server restarted
+        self._loop.call_soon_threadsafe(self._drop_connections)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def respond(self, request: bytes) -> Optional[bytes]:
+        words = request.split(b' ', 2)
+        code = b' '.join(words[:2]).decode(LARC_ENCODING)
+        self._requests[code] = self._requests.get(code, 0) + 1
+
+        fields = words[2].split(b':', 2) if len(words) == 3 else []
+        if len(fields) < 2 or not fields[0].isdigit():
+            return LARC_INVALID_USER
+        user_id, password = int(fields[0]), fields[1].decode(LARC_ENCODING)
+        if self._passwords is not None and self._passwords.get(user_id) != password:
+            return LARC_INVALID_USER
+        args = fields[2] if len(fields) == 3 else b''
+
+        if user_id not in self._users:
+            self._add_user(user_id)
+        if user_id not in self._inboxes:
+            self._inboxes[user_id] = deque(maxlen=self._inbox_size)
+
+        if code == 'GET USERS':
+            return self._get_users()
+        if code == 'GET PLAYERS':
+            return self._get_players()
+        if code == 'GET MESSAGE':
+            return self._get_message(user_id)
+        if code == 'GET CARD':
+            return self._get_card(user_id)
+        if code == 'SEND MESSAGE':
+            return self._send_message(user_id, args)
+        if code == 'SEND GAME':
+            return self._send_game(user_id, args)
+        return b''
+
+    def _add_user(self, user_id: int) -> None:
+        name = f'user_{user_id}'
+        self._users[user_id] = [name + 'x' * max(0, self._name_size - len(name)), user_id % 7]
+        self._users_payload = None
+
+    def _get_users(self) -> bytes:
+        if self._users_payload is None:
+            self._users_payload = b':'.join(
+                f'{user_id}:{name}:{victories}'.encode(LARC_ENCODING)
+                for user_id, (name, victories) in self._users.items()
+            )
+        return self._users_payload
+
+    def _get_players(self) -> bytes:
+        if self._players_payload is None:
+            self._players_payload = b':'.join(
+                f'{user_id}:{status}'.encode(LARC_ENCODING) for user_id, status in self._players.items()
+            )
+        return self._players_payload
+
+    def _get_message(self, user_id: int) -> bytes:
+        inbox = self._inboxes[user_id]
+        if len(inbox) == 0:
+            return b''
+        sender_id, data = inbox.popleft()
+        return f'{sender_id}:{data}'.encode(LARC_ENCODING)
+
+    def _get_card(self, user_id: int) -> bytes:
+        if self._players.get(user_id) not in (LarcPlayerStatus.PLAYING.name, LarcPlayerStatus.GETTING.name):
+            return b''
+        value = self._random.choice(LARC_CARD_VALUES)
+        suit = self._random.choice(list(LarcCardSuit)).name
+        return f'{value}:{suit}'.encode(LARC_ENCODING)
+
+    def _send_message(self, user_id: int, args: bytes) -> None:
+        dest_id, _, data = args.decode(LARC_ENCODING).partition(':')
+        if not dest_id.isdigit():
+            return
+        dest_id = int(dest_id)
+        recipients = [*self._inboxes] if dest_id == 0 else [dest_id]
+        for recipient in recipients:
+            if recipient != user_id:
+                self._inboxes.setdefault(recipient, deque(maxlen=self._inbox_size)).append((user_id, data))
+
+    def _send_game(self, user_id: int, args: bytes) -> None:
+        command = args.decode(LARC_ENCODING)
+        if command == 'ENTER':
+            self._players[user_id] = LarcPlayerStatus.PLAYING.name
+        elif command == 'STOP':
+            self._players[user_id] = LarcPlayerStatus.WAITING.name
+        elif command == 'QUIT':
+            self._players[user_id] = LarcPlayerStatus.IDLE.name
+        self._players_payload = None
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._serve())
+        finally:
+            self._loop.close()
+
+    async def _serve(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        server = await asyncio.start_server(self._handle_tcp, self._host, self._tcp_port)
+        self._tcp_port = server.sockets[0].getsockname()[1]
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _LarcSimulatorDatagramProtocol(self),
+            local_addr=(self._host, self._udp_port),
+        )
+        self._udp_port = transport.get_extra_info('sockname')[1]
+        generator = loop.create_task(self._generate_messages()) if self._message_rate > 0 else None
+        self._ready.set()
+
+        await self._stopping.wait()
+
+        if generator is not None:
+            generator.cancel()
+        transport.close()
+        server.close()
+        # the handlers return on their own once their connection is gone
+        self._drop_connections()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await server.wait_closed()
+
+    async def _handle_tcp(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        self._writers.add(writer)
+        self._handlers.add(asyncio.current_task())
+        # responses leave in request order, each one once its own latency has elapsed
+        outgoing: asyncio.Queue = asyncio.Queue()
+        sender = loop.create_task(self._send_responses(writer, outgoing))
+        try:
+            while True:
+                line = await reader.readline()
+                if len(line) == 0:
+                    break
+                response = self.respond(line.rstrip(b'\r\n'))
+                outgoing.put_nowait((loop.time() + self._delay(), response + b'\r\n'))
+        except ConnectionError:
+            pass
+        finally:
+            sender.cancel()
+            self._writers.discard(writer)
+            self._handlers.discard(asyncio.current_task())
+            writer.close()
+
+    async def _send_responses(self, writer: asyncio.StreamWriter, outgoing: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            due, response = await outgoing.get()
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if writer.is_closing():
+                return
+            writer.write(response)
+            if outgoing.empty():
+                await writer.drain()
+
+    def _drop_connections(self) -> None:
+        for writer in [*self._writers]:
+            writer.transport.abort()
+
+    def _delay(self) -> float:
+        if self._jitter > 0:
+            return max(0.0, self._latency + self._random.uniform(-self._jitter, self._jitter))
+        return self._latency
+
+    async def _generate_messages(self) -> None:
+        loop = asyncio.get_running_loop()
+        owed = 0.0
+        last = loop.time()
+        while True:
+            await asyncio.sleep(self._MESSAGE_TICK)
+            now = loop.time()
+            owed += (now - last) * self._message_rate
+            last = now
+            senders = [*self._users]
+            while owed >= 1:
+                owed -= 1
+                for recipient, inbox in self._inboxes.items():
+                    self._sent_messages += 1
+                    text = f'message {self._sent_messages} '
+                    inbox.append((self._random.choice(senders), (text + 'x' * self._message_size)[:self._message_size]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local LARC protocol simulator.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--tcp-port', type=int, default=1012)
+    parser.add_argument('--udp-port', type=int, default=1011)
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--players', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every TCP response')
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--message-rate', type=float, default=1.0, help='messages per second for every user')
+    parser.add_argument('--message-size', type=int, default=32)
+    parser.add_argument('--name-size', type=int, default=8)
+    args = parser.parse_args()
+
+    simulator = LarcSimulator(
+        users=args.users,
+        players=args.players,
+        latency=args.latency,
+        jitter=args.jitter,
+        message_rate=args.message_rate,
+        message_size=args.message_size,
+        name_size=args.name_size,
+        host=args.host,
+        tcp_port=args.tcp_port,
+        udp_port=args.udp_port,
+    )
+    with simulator:
+        print(f'LARC simulator on {simulator.host} TCP {simulator.tcp_port} UDP {simulator.udp_port}, Ctrl+C to stop')
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
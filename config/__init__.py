@@ -11,6 +11,16 @@ def _safe_int_env(key: str, default: int):
     return default
 
 
+def _safe_float_env(key: str, default: float):
+    val = os.getenv(key)
+    try:
+        if val:
+            return float(val)
+    except Exception as e:
+        print(f'Failure to parse float environment "{key}: {val}". {e}')
+    return default
+
+
 LARC_USE_IPV6 = os.getenv('LARC_USE_IPV6', 'false').lower() == 'true'
 LARC_ADDRESS = os.getenv('LARC_ADDRESS', 'larc.inf.furb.br')
 LARC_ENCODING = os.getenv('LARC_ENCODING', 'utf-8')
@@ -19,6 +29,42 @@ LARC_UDP_PORT = _safe_int_env('LARC_UDP_PORT', 1011)
 LARC_USER_ID = _safe_int_env('LARC_USER_ID', 8638)
 LARC_USER_PASSWORD = os.getenv('LARC_USER_PASSWORD', 'hwquw')
 
-LARC_MESSAGES_REFRESH_TIMEOUT = 1
-LARC_USERS_REFRESH_TIMEOUT = 1
-LARC_PLAYERS_REFRESH_TIMEOUT = 1
+LARC_MESSAGES_REFRESH_TIMEOUT = _safe_float_env('LARC_MESSAGES_REFRESH_TIMEOUT', 1)
+LARC_USERS_REFRESH_TIMEOUT = _safe_float_env('LARC_USERS_REFRESH_TIMEOUT', 1)
+LARC_PLAYERS_REFRESH_TIMEOUT = _safe_float_env('LARC_PLAYERS_REFRESH_TIMEOUT', 1)
+
+LARC_MESSAGES_MAX_REFRESH_TIMEOUT = _safe_float_env('LARC_MESSAGES_MAX_REFRESH_TIMEOUT', 5)
+LARC_USERS_MAX_REFRESH_TIMEOUT = _safe_float_env('LARC_USERS_MAX_REFRESH_TIMEOUT', 10)
+LARC_PLAYERS_MAX_REFRESH_TIMEOUT = _safe_float_env('LARC_PLAYERS_MAX_REFRESH_TIMEOUT', 5)
+LARC_MIN_REFRESH_TIMEOUT = _safe_float_env('LARC_MIN_REFRESH_TIMEOUT', 0.25)
+LARC_ERROR_MAX_REFRESH_TIMEOUT = _safe_float_env('LARC_ERROR_MAX_REFRESH_TIMEOUT', 30)
+
+LARC_MESSAGES_MAX_BURST = _safe_int_env('LARC_MESSAGES_MAX_BURST', 50)
+LARC_MESSAGES_DRAIN_WINDOW = _safe_int_env('LARC_MESSAGES_DRAIN_WINDOW', 5)
+
+LARC_TCP_READ_CHUNK_SIZE = _safe_int_env('LARC_TCP_READ_CHUNK_SIZE', 64 * 1024)
+LARC_TCP_PIPELINING = os.getenv('LARC_TCP_PIPELINING', 'true').lower() == 'true'
+LARC_TCP_POOL_SIZE = _safe_int_env('LARC_TCP_POOL_SIZE', 2)
+LARC_TCP_POOL_RESERVED = _safe_int_env('LARC_TCP_POOL_RESERVED', 1)
+LARC_TCP_MAX_IN_FLIGHT = _safe_int_env('LARC_TCP_MAX_IN_FLIGHT', 8)
+LARC_TCP_RECONNECT_BACKOFF = _safe_float_env('LARC_TCP_RECONNECT_BACKOFF', 0.5)
+LARC_TCP_RECONNECT_MAX_BACKOFF = _safe_float_env('LARC_TCP_RECONNECT_MAX_BACKOFF', 10)
+LARC_TCP_MAX_REPLAYS = _safe_int_env('LARC_TCP_MAX_REPLAYS', 1)
+LARC_TCP_DRAIN_TIMEOUT = _safe_float_env('LARC_TCP_DRAIN_TIMEOUT', 1)
+LARC_REQUEST_TIMEOUT = _safe_float_env('LARC_REQUEST_TIMEOUT', 5)
+LARC_INTERACTIVE_REQUEST_TIMEOUT = _safe_float_env('LARC_INTERACTIVE_REQUEST_TIMEOUT', 2)
+LARC_TCP_KEEPALIVE_IDLE = _safe_int_env('LARC_TCP_KEEPALIVE_IDLE', 30)
+LARC_TCP_KEEPALIVE_INTERVAL = _safe_int_env('LARC_TCP_KEEPALIVE_INTERVAL', 10)
+LARC_TCP_KEEPALIVE_COUNT = _safe_int_env('LARC_TCP_KEEPALIVE_COUNT', 3)
+
+LARC_UI_MAX_FPS = _safe_float_env('LARC_UI_MAX_FPS', 30)
+LARC_UI_BANNER_DURATION = _safe_float_env('LARC_UI_BANNER_DURATION', 3)
+LARC_UI_BANNER_REPEAT_INTERVAL = _safe_float_env('LARC_UI_BANNER_REPEAT_INTERVAL', 10)
+# milliseconds getch waits after ESC to tell a lone ESC from the start of a key sequence
+LARC_UI_ESC_DELAY = _safe_int_env('LARC_UI_ESC_DELAY', 25)
+
+LARC_MESSAGES_HISTORY_SIZE = _safe_int_env('LARC_MESSAGES_HISTORY_SIZE', 1000)
+LARC_MESSAGES_SPILL_PATH = os.getenv('LARC_MESSAGES_SPILL_PATH', 'larc_messages.log')
+LARC_MESSAGES_SPILL_WORKERS = _safe_int_env('LARC_MESSAGES_SPILL_WORKERS', 2)
+
+LARC_LISTENER_QUEUE_SIZE = _safe_int_env('LARC_LISTENER_QUEUE_SIZE', 100)
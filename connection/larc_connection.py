@@ -1,64 +1,97 @@
 import asyncio
-from socket import socket, AF_INET, AF_INET6, SOCK_DGRAM, SOCK_STREAM, MSG_DONTWAIT, MSG_PEEK
+from socket import AF_INET, AF_INET6
 from typing import Union
 
-from config import LARC_USE_IPV6, LARC_ADDRESS, LARC_TCP_PORT, LARC_UDP_PORT, LARC_ENCODING
+from config import LARC_USE_IPV6, LARC_ADDRESS, LARC_TCP_PORT, LARC_UDP_PORT, LARC_ENCODING, LARC_TCP_PIPELINING, \
+    LARC_TCP_POOL_SIZE, LARC_TCP_POOL_RESERVED, LARC_TCP_MAX_IN_FLIGHT, LARC_TCP_DRAIN_TIMEOUT
 from connection.larc_messages import LarcMessage, LarcProtocol
-from exception.larc_exceptions import LarcInvalidCredentials
+from connection.larc_tcp_pool import LarcTcpPool, LarcTcpPoolStats
+from exception.larc_exceptions import LarcInvalidCredentials, LarcTimeout
 
 
 class LarcConnection:
 
-    def __init__(self):
-        self._tcp_lock = asyncio.Lock()
+    def __init__(
+            self,
+            pipelining: bool = LARC_TCP_PIPELINING,
+            address: str = LARC_ADDRESS,
+            tcp_port: int = LARC_TCP_PORT,
+            udp_port: int = LARC_UDP_PORT,
+            pool_size: int = LARC_TCP_POOL_SIZE,
+            pool_reserved: int = LARC_TCP_POOL_RESERVED,
+            max_in_flight: int = LARC_TCP_MAX_IN_FLIGHT,
+    ):
+        self._pipelining = pipelining
+        self._address = address
+        self._udp_port = udp_port
         self._udp_lock = asyncio.Lock()
-        self._tcp_socket: socket = None
-        self._udp_socket: socket = socket(family=AF_INET6 if LARC_USE_IPV6 else AF_INET, type=SOCK_DGRAM)
+        self._udp_transport: asyncio.DatagramTransport = None
+        self._tcp_pool = LarcTcpPool(
+            address,
+            tcp_port,
+            size=pool_size,
+            reserved=pool_reserved,
+            # without pipelining every channel carries a single request at a time
+            max_in_flight=max_in_flight if pipelining else 1,
+        )
 
-    async def send(self, message: LarcMessage) -> Union[bool, bytes]:
+    @property
+    def pipelining(self) -> bool:
+        return self._pipelining
+
+    @property
+    def pool_stats(self) -> LarcTcpPoolStats:
+        return self._tcp_pool.stats()
+
+    async def send(self, message: LarcMessage, timeout: float = None) -> Union[bool, bytes]:
+        if not timeout or timeout <= 0:
+            return await self._send(message)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        try:
+            return await asyncio.wait_for(self._send(message), timeout)
+        except asyncio.TimeoutError:
+            # a socket level TimeoutError is the same type on newer Pythons, only an expired deadline is a LarcTimeout
+            if loop.time() < deadline:
+                raise
+            raise LarcTimeout(f'{message.code} did not complete within {timeout:g}s.') from None
+
+    async def _send(self, message: LarcMessage) -> Union[bool, bytes]:
         if message.protocol == LarcProtocol.UDP:
             await self._send_udp(message)
             return True
         return await self._send_tcp(message)
 
+    async def close(self) -> None:
+        await self._tcp_pool.drain(LARC_TCP_DRAIN_TIMEOUT)
+        if self._udp_transport is not None:
+            self._udp_transport.close()
+            self._udp_transport = None
+
     async def _send_udp(self, message: LarcMessage) -> None:
-        with await self._udp_lock:
-            self._udp_socket.sendto(message.for_socket, (LARC_ADDRESS, LARC_UDP_PORT))
+        async with self._udp_lock:
+            await self._ensure_open_udp_endpoint()
+            self._udp_transport.sendto(message.for_socket)
 
     async def _send_tcp(self, message: LarcMessage) -> bytes:
-        with await self._tcp_lock:
-            self._ensure_open_tcp_connection()
-            self._tcp_socket.sendall(message.for_socket)
-
-            response = self._get_tcp_response()
-            if response == 'Usuário inválido!'.encode(encoding=LARC_ENCODING):
-                raise LarcInvalidCredentials(response.decode(encoding=LARC_ENCODING))
-            return response
-
-    def _ensure_open_tcp_connection(self) -> None:
-        started = self._tcp_socket is not None
-        if not started:
-            self._tcp_socket = socket(family=AF_INET6 if LARC_USE_IPV6 else AF_INET, type=SOCK_STREAM)
+        channel = await self._tcp_pool.acquire(message.priority, message.ordered)
+        try:
+            response = await channel.request(message.for_socket, message.idempotent)
+        finally:
+            self._tcp_pool.release(channel)
 
-        if not started or self._is_socket_closed():
-            self._tcp_socket.connect((LARC_ADDRESS, LARC_TCP_PORT))
+        if response == 'Usuário inválido!'.encode(encoding=LARC_ENCODING):
+            raise LarcInvalidCredentials(response.decode(encoding=LARC_ENCODING))
+        return response
 
-    def _is_socket_closed(self) -> bool:
-        try:
-            data = self._tcp_socket.recv(16, MSG_DONTWAIT | MSG_PEEK)
-            if len(data) == 0:
-                return True
-        except BlockingIOError:
-            return False
-        except ConnectionResetError:
-            return True
-        except Exception as e:
-            msg = str(e)
-            return 'not connected' in msg
-        return False
+    async def _ensure_open_udp_endpoint(self) -> None:
+        if self._udp_transport is not None and not self._udp_transport.is_closing():
+            return
 
-    def _get_tcp_response(self) -> bytes:
-        buff: bytes = b''
-        while not buff.endswith(b'\r\n'):
-            buff += self._tcp_socket.recv(1)
-        return buff[:-2]
+        loop = asyncio.get_running_loop()
+        self._udp_transport, _ = await loop.create_datagram_endpoint(
+            asyncio.DatagramProtocol,
+            remote_addr=(self._address, self._udp_port),
+            family=AF_INET6 if LARC_USE_IPV6 else AF_INET,
+        )
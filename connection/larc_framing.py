@@ -0,0 +1,32 @@
+from typing import Optional, Union
+
+LARC_FRAME_DELIMITER = b'\r\n'
+
+
+class LarcFrameBuffer:
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._scan_offset = 0
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def feed(self, data: Union[bytes, bytearray, memoryview]) -> None:
+        self._buffer += data
+
+    def next_frame(self) -> Optional[bytes]:
+        idx = self._buffer.find(LARC_FRAME_DELIMITER, self._scan_offset)
+        if idx < 0:
+            # a CR at the end of the buffer may still be followed by its LF, so it is scanned again
+            self._scan_offset = max(len(self._buffer) - 1, 0)
+            return None
+
+        frame = bytes(memoryview(self._buffer)[:idx])
+        del self._buffer[:idx + len(LARC_FRAME_DELIMITER)]
+        self._scan_offset = 0
+        return frame
+
+    def clear(self) -> None:
+        self._buffer.clear()
+        self._scan_offset = 0
@@ -1,11 +1,23 @@
 import enum
 from abc import ABC
-from typing import List
+from typing import Dict, Tuple, TYPE_CHECKING
 
-from config import LARC_ENCODING
+from config import LARC_ENCODING, LARC_REQUEST_TIMEOUT, LARC_INTERACTIVE_REQUEST_TIMEOUT
+from connection.larc_parsers import LarcRecordParser
 from model.larc_models import LarcUser, LarcSentMessage, LarcPlayer, LarcPlayerStatus, LarcCard, LarcCardSuit, \
     LarcReceivedMessage
 
+if TYPE_CHECKING:
+    from connection.larc_connection import LarcConnection
+
+
+def _build_user(id_: bytes, name: bytes, victories: bytes) -> LarcUser:
+    return LarcUser(id_=int(id_), name=name.decode(LARC_ENCODING), victories=int(victories))
+
+
+def _build_player(user_id: bytes, status: bytes) -> LarcPlayer:
+    return LarcPlayer(user_id=int(user_id), status=LarcPlayerStatus[status.decode(LARC_ENCODING)])
+
 
 class LarcCredentials:
 
@@ -25,7 +37,20 @@ class LarcProtocol(enum.Enum):
     UDP = 1
 
 
+class LarcPriority(enum.IntEnum):
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
 class LarcMessage(ABC):
+    # frames only depend on the code, the credentials and the args, so each combination is encoded once
+    _frames: Dict[Tuple, bytes] = {}
+    _priority: LarcPriority = LarcPriority.BACKGROUND
+    # set when the server answers in the order the requests arrive, so they must share a connection
+    _ordered: bool = False
+    # set when sending the request twice has the same effect as sending it once, so it can be replayed
+    _idempotent: bool = False
+    _timeout: float = LARC_REQUEST_TIMEOUT
 
     def __init__(
             self,
@@ -41,60 +66,89 @@ class LarcMessage(ABC):
         if code is None or len(code) == 0:
             raise RuntimeError('Invalid LARC message code. It must have at least 1 char.')
 
-        if args is None:
-            args = []
-
-        # only import at this point because of a cyclic import
-        from connection.larc_connection import LarcConnection
-
-        self._connection: LarcConnection = connection
+        self._connection: 'LarcConnection' = connection
         self._code: str = code
         self._credentials: LarcCredentials = credentials
-        self._args: [] = list(map(lambda x: f'{x}', args))
+        self._args: Tuple[str, ...] = tuple(str(arg) for arg in args) if args else ()
         self._protocol: LarcProtocol = protocol
-        self._response = None
+        self._frame: bytes = None
+
+    @property
+    def code(self) -> str:
+        return self._code
 
     @property
     def protocol(self) -> LarcProtocol:
         return self._protocol
 
+    @property
+    def priority(self) -> LarcPriority:
+        return self._priority
+
+    @property
+    def ordered(self) -> bool:
+        return self._ordered
+
+    @property
+    def idempotent(self) -> bool:
+        return self._idempotent
+
+    @property
+    def timeout(self) -> float:
+        return self._timeout
+
     @property
     def for_socket(self) -> bytes:
-        args = []
-        if self._credentials is not None:
-            args.append(str(self._credentials.user_id))
-            args.append(self._credentials.user_password)
-        args.extend(self._args)
-        return str.encode(f'{self._code} {":".join(args)}\r\n', encoding=LARC_ENCODING)
-
-    async def execute(self):
-        if self._response is None:
-            response = await self._connection.send(self)
-            self._response = self._parse_response(response)
-        return self._response
+        if self._frame is None:
+            self._frame = self._encode()
+        return self._frame
+
+    async def execute(self, timeout: float = None):
+        # a message keeps no response state, so the same instance can be executed repeatedly and concurrently
+        response = await self._connection.send(self, self._timeout if timeout is None else timeout)
+        return self._parse_response(response)
+
+    def _encode(self) -> bytes:
+        key = (self._code, *_credentials_key(self._credentials), self._args)
+        frame = LarcMessage._frames.get(key)
+        if frame is None:
+            frame = _encode_frame(self._code, self._credentials, self._args)
+            LarcMessage._frames[key] = frame
+        return frame
 
     def _parse_response(self, response: bytes) -> bytes:
         return response
 
 
+def _credentials_key(credentials: LarcCredentials) -> Tuple:
+    if credentials is None:
+        return None, None
+    return credentials.user_id, credentials.user_password
+
+
+def _encode_frame(code: str, credentials: LarcCredentials, args: Tuple[str, ...]) -> bytes:
+    fields = []
+    if credentials is not None:
+        fields.append(str(credentials.user_id))
+        fields.append(credentials.user_password)
+    fields.extend(args)
+    return f'{code} {":".join(fields)}\r\n'.encode(LARC_ENCODING)
+
+
 class LarcGetUsers(LarcMessage):
+    _idempotent = True
 
     def __init__(self, connection, credentials: LarcCredentials):
         super(LarcGetUsers, self).__init__(code='GET USERS', connection=connection, credentials=credentials)
+        # the parser remembers the previous payload, so it belongs to the request of a single session
+        self._parser = LarcRecordParser(fields=3, build=_build_user)
 
-    def _parse_response(self, response: bytes) -> List[LarcUser]:
-        users = []
-        if response is not None and len(response) > 0:
-            parts = response.decode(LARC_ENCODING).split(':')
-            for i in range(2, len(parts), 3):
-                id_ = int(parts[i - 2])
-                name = parts[i - 1]
-                victories = int(parts[i])
-                users.append(LarcUser(id_=id_, name=name, victories=victories))
-        return users
+    def _parse_response(self, response: bytes) -> Tuple[LarcUser, ...]:
+        return self._parser.parse(response)
 
 
 class LarcGetMessage(LarcMessage):
+    _ordered = True
 
     def __init__(self, connection, credentials: LarcCredentials):
         super(LarcGetMessage, self).__init__(code='GET MESSAGE', connection=connection, credentials=credentials)
@@ -110,6 +164,8 @@ class LarcGetMessage(LarcMessage):
 
 
 class LarcSendMessage(LarcMessage):
+    # the message text is different on every send, so only the encoded prefix is cached
+    _prefixes: Dict[Tuple, bytes] = {}
 
     def __init__(self, connection, credentials: LarcCredentials, user_dest_id: int, message_data: str):
         if user_dest_id is None:
@@ -120,9 +176,21 @@ class LarcSendMessage(LarcMessage):
             code='SEND MESSAGE',
             connection=connection,
             credentials=credentials,
-            args=[user_dest_id, message_data],
             protocol=LarcProtocol.UDP,
         )
+        self._user_dest_id = user_dest_id
+        self._message_data = message_data
+
+    def _encode(self) -> bytes:
+        credentials = self._credentials
+        key = _credentials_key(credentials)
+        prefix = LarcSendMessage._prefixes.get(key)
+        if prefix is None:
+            # the frame without args, minus its delimiter, followed by the separator of the first arg
+            prefix = _encode_frame(self._code, credentials, ())[:-2] + (b':' if credentials is not None else b'')
+            LarcSendMessage._prefixes[key] = prefix
+
+        return b''.join((prefix, b'%d:' % self._user_dest_id, self._message_data.encode(LARC_ENCODING), b'\r\n'))
 
 
 class LarcSendMessageToAll(LarcSendMessage):
@@ -139,22 +207,20 @@ class LarcSendMessageToAll(LarcSendMessage):
 
 
 class LarcGetPlayers(LarcMessage):
+    _idempotent = True
 
     def __init__(self, connection, credentials: LarcCredentials):
         super(LarcGetPlayers, self).__init__(code='GET PLAYERS', connection=connection, credentials=credentials)
+        # the parser remembers the previous payload, so it belongs to the request of a single session
+        self._parser = LarcRecordParser(fields=2, build=_build_player)
 
-    def _parse_response(self, response: bytes) -> List[LarcPlayer]:
-        players = []
-        if response is not None and len(response) > 0:
-            parts = response.decode(LARC_ENCODING).split(':')
-            for i in range(1, len(parts), 2):
-                user_id = int(parts[i - 1])
-                status = parts[i]
-                players.append(LarcPlayer(user_id=user_id, status=LarcPlayerStatus[status]))
-        return players
+    def _parse_response(self, response: bytes) -> Tuple[LarcPlayer, ...]:
+        return self._parser.parse(response)
 
 
 class LarcGetCard(LarcMessage):
+    _priority = LarcPriority.INTERACTIVE
+    _timeout = LARC_INTERACTIVE_REQUEST_TIMEOUT
 
     def __init__(self, connection, credentials: LarcCredentials):
         super(LarcGetCard, self).__init__(code='GET CARD', connection=connection, credentials=credentials)
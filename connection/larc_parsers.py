@@ -0,0 +1,43 @@
+from typing import Callable, Dict, Iterator, List, Tuple, TypeVar, Union
+
+T = TypeVar('T')
+
+
+def iter_records(response: Union[bytes, memoryview], fields: int) -> Iterator[Tuple[bytes, ...]]:
+    # the raw fields are never decoded here, a record is only decoded when it is built; one split in C beats a
+    # find() scan yielding record by record, bytes() only copies a memoryview and returns a bytes payload as is
+    parts = bytes(response).split(b':')
+    it = iter(parts)
+    return zip(*[it] * fields)
+
+
+class LarcRecordParser:
+
+    def __init__(self, fields: int, build: Callable[..., T]):
+        self._fields = fields
+        self._build = build
+        self._previous: Dict[Tuple[bytes, ...], T] = {}
+        self._payload: bytes = None
+        self._result: Tuple[T, ...] = ()
+
+    def parse(self, response: bytes) -> Tuple[T, ...]:
+        if response is None or len(response) == 0:
+            return ()
+
+        if response == self._payload:
+            # the very same tuple, so callers can tell a repeated payload apart without looking at the records
+            return self._result
+
+        previous = self._previous
+        current: Dict[Tuple[bytes, ...], T] = {}
+        result: List[T] = []
+        for record in iter_records(response, self._fields):
+            # an entry that did not change since the last poll keeps its object
+            item = previous.get(record)
+            if item is None:
+                item = self._build(*record)
+            current[record] = item
+            result.append(item)
+
+        self._previous, self._payload, self._result = current, bytes(response), tuple(result)
+        return self._result
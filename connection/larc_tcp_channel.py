@@ -0,0 +1,244 @@
+import asyncio
+import enum
+import random
+import socket
+from collections import deque
+from typing import Deque
+
+from config import LARC_USE_IPV6, LARC_TCP_READ_CHUNK_SIZE, LARC_TCP_RECONNECT_BACKOFF, \
+    LARC_TCP_RECONNECT_MAX_BACKOFF, LARC_TCP_MAX_REPLAYS, LARC_TCP_KEEPALIVE_IDLE, LARC_TCP_KEEPALIVE_INTERVAL, \
+    LARC_TCP_KEEPALIVE_COUNT
+from connection.larc_framing import LarcFrameBuffer
+
+
+def _connection_error(error: OSError) -> ConnectionError:
+    if isinstance(error, ConnectionError):
+        return error
+    # a peer found dead by keepalive is reported as ETIMEDOUT, which must still count as a lost connection
+    reset = ConnectionResetError(f'The LARC connection was lost: {error}')
+    reset.__cause__ = error
+    return reset
+
+
+class LarcChannelState(enum.Enum):
+    CLOSED = 0
+    CONNECTING = 1
+    READY = 2
+    DRAINING = 3
+    BROKEN = 4
+
+
+class LarcTcpChannel:
+
+    def __init__(self, address: str, port: int):
+        self._address = address
+        self._port = port
+        self._state = LarcChannelState.CLOSED
+        self._connect_lock = asyncio.Lock()
+        self._drained = asyncio.Event()
+        self._reader: asyncio.StreamReader = None
+        self._writer: asyncio.StreamWriter = None
+        self._reader_task: asyncio.Task = None
+        self._pending: Deque[asyncio.Future] = deque()
+        self._failures = 0
+        self._retry_at = 0.0
+        self.connects = 0
+        self.replays = 0
+        self.last_connect_time = 0.0
+        self.max_connect_time = 0.0
+        self.total_connect_time = 0.0
+
+    @property
+    def state(self) -> LarcChannelState:
+        return self._state
+
+    @property
+    def connected(self) -> bool:
+        return self._state == LarcChannelState.READY
+
+    @property
+    def retry_at(self) -> float:
+        return self._retry_at
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    async def request(self, frame: bytes, idempotent: bool = False) -> bytes:
+        replays = 0
+        while True:
+            if self._state != LarcChannelState.READY:
+                await self._ensure_ready()
+            try:
+                return await self._exchange(frame)
+            except ConnectionError:
+                # a request that can safely run twice is sent again over a new connection, unless closed on purpose
+                if not idempotent or replays >= LARC_TCP_MAX_REPLAYS or self._state == LarcChannelState.CLOSED:
+                    raise
+                replays += 1
+                self.replays += 1
+
+    async def drain(self, timeout: float) -> None:
+        if self._state != LarcChannelState.READY:
+            self.close(ConnectionResetError('The LARC connection was closed.'))
+            return
+
+        # no new request is written from now on, the ones already sent still get their responses
+        self._state = LarcChannelState.DRAINING
+        self._drained.clear()
+        if len(self._pending) > 0:
+            try:
+                await asyncio.wait_for(self._drained.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        self.close(ConnectionResetError('The LARC connection was closed.'))
+
+    def close(self, error: Exception) -> None:
+        self._state = LarcChannelState.CLOSED
+        self._failures = 0
+        self._retry_at = 0.0
+        self._disconnect(error)
+        self._drained.set()
+
+    async def _exchange(self, frame: bytes) -> bytes:
+        if self._writer.is_closing():
+            # the transport already lost the connection, the reader task just didn't get to run yet
+            error = ConnectionResetError('The LARC server closed the connection.')
+            self._break(error)
+            raise error
+
+        # the server answers in order, so the future queue must follow the exact order of the writes
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(future)
+        try:
+            self._writer.write(frame)
+            await self._writer.drain()
+        except BaseException as e:
+            # nobody is left to await the queued future, even if the reader already failed it
+            if not future.cancel():
+                future.exception()
+            if isinstance(e, OSError):
+                error = _connection_error(e)
+                self._break(error)
+                if error is not e:
+                    raise error from e
+            raise
+
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # the cancelled future keeps its place in the queue, so its late response is read and dropped instead of
+            # answering the next request, once nobody is waiting on this connection it is simply started over
+            if all(pending.done() for pending in self._pending):
+                self._break(ConnectionResetError('A LARC request was cancelled before its response arrived.'))
+            raise
+
+    async def _ensure_ready(self) -> None:
+        while self._state != LarcChannelState.READY:
+            if self._state == LarcChannelState.DRAINING:
+                await self._drained.wait()
+                continue
+
+            async with self._connect_lock:
+                if self._state != LarcChannelState.READY:
+                    await self._connect()
+
+    async def _connect(self) -> None:
+        loop = asyncio.get_running_loop()
+        delay = self._retry_at - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        self._state = LarcChannelState.CONNECTING
+        started = loop.time()
+        try:
+            self._reader, self._writer = await asyncio.open_connection(
+                host=self._address,
+                port=self._port,
+                family=socket.AF_INET6 if LARC_USE_IPV6 else socket.AF_INET,
+            )
+        except OSError:
+            # repeated failures back off exponentially, with jitter so many clients don't reconnect in step
+            self._failures += 1
+            backoff = min(LARC_TCP_RECONNECT_MAX_BACKOFF, LARC_TCP_RECONNECT_BACKOFF * 2 ** (self._failures - 1))
+            self._retry_at = loop.time() + random.uniform(backoff / 2, backoff)
+            self._state = LarcChannelState.BROKEN
+            raise
+
+        self._enable_keepalive(self._writer.get_extra_info('socket'))
+        self.connects += 1
+        self.last_connect_time = loop.time() - started
+        self.max_connect_time = max(self.max_connect_time, self.last_connect_time)
+        self.total_connect_time += self.last_connect_time
+
+        self._failures = 0
+        self._retry_at = 0.0
+        self._pending = deque()
+        self._reader_task = loop.create_task(self._read_responses(self._reader, self._pending))
+        self._state = LarcChannelState.READY
+
+    @staticmethod
+    def _enable_keepalive(sock) -> None:
+        if sock is None:
+            return
+        # a peer that silently went away is detected by the kernel instead of a probe before every request
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        for option, value in (
+                ('TCP_KEEPIDLE', LARC_TCP_KEEPALIVE_IDLE),
+                ('TCP_KEEPINTVL', LARC_TCP_KEEPALIVE_INTERVAL),
+                ('TCP_KEEPCNT', LARC_TCP_KEEPALIVE_COUNT),
+        ):
+            if hasattr(socket, option):
+                sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+
+    def _break(self, error: Exception) -> None:
+        if self._state in (LarcChannelState.READY, LarcChannelState.DRAINING):
+            # the first reconnect after a working connection is immediate, only failed connects back off
+            self._state = LarcChannelState.BROKEN
+            self._disconnect(error)
+            self._drained.set()
+
+    def _disconnect(self, error: Exception) -> None:
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+        if self._writer is not None:
+            self._writer.close()
+            self._reader, self._writer = None, None
+        self._fail_pending(self._pending, error)
+
+    async def _read_responses(self, reader: asyncio.StreamReader, pending: Deque[asyncio.Future]) -> None:
+        frames = LarcFrameBuffer()
+        try:
+            while True:
+                frame = frames.next_frame()
+                while frame is None:
+                    data = await reader.read(LARC_TCP_READ_CHUNK_SIZE)
+                    if len(data) == 0:
+                        raise ConnectionResetError('The LARC server closed the connection.')
+                    frames.feed(data)
+                    frame = frames.next_frame()
+
+                if len(pending) > 0:
+                    future = pending.popleft()
+                    if not future.done():
+                        future.set_result(frame)
+                if len(pending) == 0 and self._state == LarcChannelState.DRAINING:
+                    self._drained.set()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if isinstance(e, OSError):
+                e = _connection_error(e)
+            if reader is self._reader:
+                self._reader_task = None
+                self._break(e)
+            else:
+                self._fail_pending(pending, e)
+
+    @staticmethod
+    def _fail_pending(pending: Deque[asyncio.Future], error: Exception) -> None:
+        while len(pending) > 0:
+            future = pending.popleft()
+            if not future.done():
+                future.set_exception(error)
@@ -0,0 +1,157 @@
+import asyncio
+import heapq
+import itertools
+from typing import List, Optional, Tuple
+
+from config import LARC_TCP_POOL_SIZE, LARC_TCP_POOL_RESERVED, LARC_TCP_MAX_IN_FLIGHT
+from connection.larc_messages import LarcPriority
+from connection.larc_tcp_channel import LarcTcpChannel, LarcChannelState
+
+
+class LarcTcpPoolStats:
+
+    def __init__(self):
+        self.size = 0
+        self.connected = 0
+        self.broken = 0
+        self.in_use = 0
+        self.in_flight = 0
+        self.waiters = 0
+        self.max_waiters = 0
+        self.waits = 0
+        self.total_wait_time = 0.0
+        self.connects = 0
+        self.replays = 0
+        self.last_connect_time = 0.0
+        self.max_connect_time = 0.0
+        self.total_connect_time = 0.0
+
+
+class LarcTcpPool:
+
+    def __init__(
+            self,
+            address: str,
+            port: int,
+            size: int = LARC_TCP_POOL_SIZE,
+            reserved: int = LARC_TCP_POOL_RESERVED,
+            max_in_flight: int = LARC_TCP_MAX_IN_FLIGHT,
+    ):
+        if size <= 0:
+            raise RuntimeError('The TCP pool size must be greater than zero.')
+
+        self._channels: List[LarcTcpChannel] = [LarcTcpChannel(address, port) for _ in range(size)]
+        # background requests never use the last "reserved" channels, so interactive ones always find a free one
+        self._background_size = max(1, size - max(0, reserved))
+        self._max_in_flight = max(1, max_in_flight)
+        self._leases: List[int] = [0] * size
+        self._waiters: List[Tuple[int, int, bool, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._stats = LarcTcpPoolStats()
+
+    @property
+    def channels(self) -> List[LarcTcpChannel]:
+        return [*self._channels]
+
+    def stats(self) -> LarcTcpPoolStats:
+        stats = self._stats
+        stats.size = len(self._channels)
+        stats.connected = sum(1 for channel in self._channels if channel.connected)
+        stats.broken = sum(1 for channel in self._channels if channel.state == LarcChannelState.BROKEN)
+        stats.in_use = sum(1 for leases in self._leases if leases > 0)
+        stats.in_flight = sum(self._leases)
+        stats.waiters = sum(1 for *_, future in self._waiters if not future.done())
+        stats.connects = sum(channel.connects for channel in self._channels)
+        stats.replays = sum(channel.replays for channel in self._channels)
+        stats.last_connect_time = max((channel.last_connect_time for channel in self._channels), default=0.0)
+        stats.max_connect_time = max((channel.max_connect_time for channel in self._channels), default=0.0)
+        stats.total_connect_time = sum(channel.total_connect_time for channel in self._channels)
+        return stats
+
+    async def acquire(self, priority: LarcPriority = LarcPriority.BACKGROUND, ordered: bool = False) -> LarcTcpChannel:
+        # a request never overtakes waiters of the same or a higher priority that could use the same channel
+        index = self._pick(priority, ordered)
+        if index is not None and not self._has_waiters(priority, index):
+            self._leases[index] += 1
+            return self._channels[index]
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), ordered, future))
+        self._stats.waits += 1
+        self._stats.max_waiters = max(self._stats.max_waiters, len(self._waiters))
+        started = loop.time()
+        try:
+            index = await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(self._channels[future.result()])
+            raise
+        finally:
+            self._stats.total_wait_time += loop.time() - started
+        return self._channels[index]
+
+    def release(self, channel: LarcTcpChannel) -> None:
+        self._leases[self._channels.index(channel)] -= 1
+        self._wake()
+
+    async def drain(self, timeout: float) -> None:
+        await asyncio.gather(*[channel.drain(timeout) for channel in self._channels])
+        self.close(ConnectionResetError('The LARC connection was closed.'))
+
+    def close(self, error: Exception) -> None:
+        for channel in self._channels:
+            channel.close(error)
+        while len(self._waiters) > 0:
+            *_, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_exception(error)
+
+    def _pick(self, priority: LarcPriority, ordered: bool) -> Optional[int]:
+        if ordered:
+            # responses that depend on server side order, like the GET MESSAGE queue, all share the first channel
+            return 0 if self._leases[0] < self._max_in_flight else None
+
+        limit = len(self._channels) if priority == LarcPriority.INTERACTIVE else self._background_size
+        now = asyncio.get_running_loop().time()
+        best, best_key = None, None
+        for index in range(limit):
+            leases = self._leases[index]
+            if leases >= self._max_in_flight:
+                continue
+            channel = self._channels[index]
+            # a broken channel still waiting for its reconnect backoff is only used when nothing else is free
+            key = (channel.state == LarcChannelState.BROKEN and channel.retry_at > now, leases)
+            if best is None or key < best_key:
+                best, best_key = index, key
+                if key == (False, 0):
+                    break
+        return best
+
+    def _can_use(self, priority: LarcPriority, ordered: bool, index: int) -> bool:
+        if ordered:
+            return index == 0
+        return index < (len(self._channels) if priority == LarcPriority.INTERACTIVE else self._background_size)
+
+    def _has_waiters(self, priority: LarcPriority, index: int) -> bool:
+        for waiter_priority, _, ordered, future in self._waiters:
+            if waiter_priority <= priority and not future.done() and self._can_use(waiter_priority, ordered, index):
+                return True
+        return False
+
+    def _wake(self) -> None:
+        if len(self._waiters) == 0:
+            return
+
+        # waiters are served in priority order, one that finds all of its channels busy doesn't hold back the ones
+        # behind it, since whatever they get is a channel it can't use
+        for priority, _, ordered, future in sorted(self._waiters):
+            if future.done():
+                continue
+            index = self._pick(priority, ordered)
+            if index is not None:
+                self._leases[index] += 1
+                future.set_result(index)
+
+        self._waiters = [waiter for waiter in self._waiters if not waiter[3].done()]
+        heapq.heapify(self._waiters)
@@ -1,40 +1,43 @@
-import enum
 import uuid
-from typing import List, Union
+from contextlib import asynccontextmanager
+from typing import List, Union, Dict, Optional, Tuple, Iterator, Iterable, Sequence
 
-from config import LARC_USER_ID, LARC_USER_PASSWORD
+from config import LARC_USER_ID, LARC_USER_PASSWORD, LARC_LISTENER_QUEUE_SIZE, LARC_MESSAGES_SPILL_PATH
 from connection.larc_connection import LarcConnection
 from connection.larc_messages import LarcCredentials
+from context.larc_context_events import LarcContextEventType, LarcContextEvent, LarcContextDiff
+from context.larc_event_dispatcher import LarcEventDispatcher, LarcOverflowPolicy, LarcSubscriberStats, LarcEventFilter
+from context.larc_indexed_store import LarcIndexedStore
+from context.larc_message_history import LarcMessageHistory
+from context.larc_snapshot import LarcSnapshot
 from model.larc_models import LarcUser, LarcSentMessage, LarcPlayer, LarcCard, LarcReceivedMessage
 
 
-class LarcContextEventType(enum.Enum):
-    NEW_MESSAGE = 0
-    USERS = 1
-    ERROR = 2
-    PLAYERS = 3
-    CARDS = 4
-
-
-class LarcContextEvent:
-
-    def __init__(self, type_: LarcContextEventType, data=None):
-        self.type_ = type_
-        self.data = data
-
-
 class LarcContext:
     _instance = None
 
-    def __init__(self):
-        self._listeners = dict()
-        self._users: List[LarcUser] = []
-        self._players: List[LarcPlayer] = []
-        self._messages: List[Union[LarcSentMessage, LarcReceivedMessage]] = []
-        self._cards: List[LarcCard] = []
+    def __init__(
+            self,
+            credentials: LarcCredentials = None,
+            connection: LarcConnection = None,
+            spill_path: Optional[str] = LARC_MESSAGES_SPILL_PATH,
+    ):
+        self._dispatcher = LarcEventDispatcher()
+        self._users: LarcIndexedStore[LarcUser] = LarcIndexedStore(key=lambda user: user.id_)
+        self._players: LarcIndexedStore[LarcPlayer] = LarcIndexedStore(key=lambda player: player.user_id)
+        self._users_source: Sequence[LarcUser] = ()
+        self._users_fingerprint: Tuple = ()
+        self._users_rows: Dict[int, Tuple] = {}
+        self._players_source: Sequence[LarcPlayer] = ()
+        self._players_fingerprint: Tuple = ()
+        self._players_rows: Dict[int, Tuple] = {}
+        self._messages = LarcMessageHistory(spill_path=spill_path)
+        self._cards: LarcSnapshot[LarcCard] = LarcSnapshot()
         self._error: Exception = None
-        self._credentials = LarcCredentials(user_id=LARC_USER_ID, user_password=LARC_USER_PASSWORD)
-        self._connection = LarcConnection()
+        self._transaction_depth = 0
+        self._transaction_events: List[LarcContextEvent] = []
+        self._credentials = credentials or LarcCredentials(user_id=LARC_USER_ID, user_password=LARC_USER_PASSWORD)
+        self._connection = connection or LarcConnection()
 
     @staticmethod
     def instance():
@@ -51,45 +54,73 @@ class LarcContext:
         return self._credentials
 
     @property
-    def messages(self) -> List[Union[LarcSentMessage, LarcReceivedMessage]]:
-        messages = []
-        messages.extend(self._messages)
-        return messages
+    def messages(self) -> LarcSnapshot[Union[LarcSentMessage, LarcReceivedMessage]]:
+        return self._messages.snapshot()
 
     @property
-    def users(self) -> List[LarcUser]:
-        users = []
-        users.extend(self._users)
-        return users
+    def message_history(self) -> LarcMessageHistory:
+        return self._messages
 
     @property
-    def players(self) -> List[LarcPlayer]:
-        players = []
-        players.extend(self._players)
-        return players
+    def users(self) -> LarcSnapshot[LarcUser]:
+        return self._users.snapshot()
 
     @property
-    def cards(self) -> List[LarcCard]:
-        cards = []
-        cards.extend(self._cards)
-        return cards
+    def players(self) -> LarcSnapshot[LarcPlayer]:
+        return self._players.snapshot()
+
+    @property
+    def cards(self) -> LarcSnapshot[LarcCard]:
+        return self._cards
 
     @property
     def error(self) -> Exception:
         return self._error
 
     def get_user_by_id(self, user_id: int) -> LarcUser:
-        for user in self._users:
-            if user.id_ == user_id:
-                return user
+        return self._users.get(user_id)
+
+    def get_player_by_id(self, user_id: int) -> LarcPlayer:
+        return self._players.get(user_id)
+
+    async def search_messages(self, text: str) -> List[Union[LarcSentMessage, LarcReceivedMessage]]:
+        return await self._messages.search(text)
+
+    def iter_users(self) -> Iterator[LarcUser]:
+        return iter(self._users)
+
+    def iter_players(self) -> Iterator[LarcPlayer]:
+        return iter(self._players)
 
-    def add_listener(self, listener) -> str:
+    def add_listener(
+            self,
+            listener,
+            event_types: Iterable[LarcContextEventType] = None,
+            user_id: int = None,
+            max_size: int = LARC_LISTENER_QUEUE_SIZE,
+            policy: LarcOverflowPolicy = LarcOverflowPolicy.COALESCE,
+    ) -> str:
         id_ = str(uuid.uuid4())
-        self._listeners[id_] = listener
+        self._dispatcher.subscribe(
+            id_,
+            listener,
+            max_size=max_size,
+            policy=policy,
+            event_filter=LarcEventFilter(event_types=event_types, user_id=user_id),
+        )
         return id_
 
     def remove_listener(self, listener_id: str) -> None:
-        del self._listeners[listener_id]
+        self._dispatcher.unsubscribe(listener_id)
+
+    def listener_stats(self) -> Dict[str, LarcSubscriberStats]:
+        return self._dispatcher.stats()
+
+    async def close(self) -> None:
+        for listener_id in [*self._dispatcher.stats()]:
+            self._dispatcher.unsubscribe(listener_id)
+        self._messages.close()
+        await self._connection.close()
 
     async def append_message(self, message: LarcSentMessage):
         self._messages.append(message)
@@ -97,28 +128,57 @@ class LarcContext:
         event = LarcContextEvent(LarcContextEventType.NEW_MESSAGE, message)
         await self._fire_listeners(event)
 
-    async def set_users(self, users: List[LarcUser]) -> None:
-        self._users = users
-        self._users.sort(key=lambda user: user.id_)
+    async def set_users(self, users: Sequence[LarcUser]) -> Optional[LarcContextDiff]:
+        # a parser hands back the same tuple for a byte-identical payload, so a repeated poll costs nothing
+        if isinstance(users, tuple) and users is self._users_source:
+            return None
+        self._users_source = users
+
+        fingerprint = tuple((user.id_, user.name, user.victories) for user in users)
+        if fingerprint == self._users_fingerprint:
+            return None
+
+        rows = {row[0]: row for row in fingerprint}
+        diff = LarcContextDiff.between(self._users_rows, rows)
+        self._users_fingerprint, self._users_rows = fingerprint, rows
+        if diff.empty:
+            return None
+
+        self._users.update(users, diff.added, diff.removed, diff.updated)
 
-        event = LarcContextEvent(LarcContextEventType.USERS)
+        event = LarcContextEvent(LarcContextEventType.USERS, diff)
         await self._fire_listeners(event)
+        return diff
 
-    async def set_players(self, players: List[LarcPlayer]) -> None:
-        self._players = players
-        self._players.sort(key=lambda player: player.user_id)
+    async def set_players(self, players: Sequence[LarcPlayer]) -> Optional[LarcContextDiff]:
+        if isinstance(players, tuple) and players is self._players_source:
+            return None
+        self._players_source = players
 
-        event = LarcContextEvent(LarcContextEventType.PLAYERS)
+        fingerprint = tuple((player.user_id, player.status) for player in players)
+        if fingerprint == self._players_fingerprint:
+            return None
+
+        rows = {row[0]: row for row in fingerprint}
+        diff = LarcContextDiff.between(self._players_rows, rows)
+        self._players_fingerprint, self._players_rows = fingerprint, rows
+        if diff.empty:
+            return None
+
+        self._players.update(players, diff.added, diff.removed, diff.updated)
+
+        event = LarcContextEvent(LarcContextEventType.PLAYERS, diff)
         await self._fire_listeners(event)
+        return diff
 
     async def append_card(self, card: LarcCard) -> None:
-        self._cards.append(card)
+        self._cards = LarcSnapshot(self._cards[:] + (card,), self._cards.version + 1)
 
         event = LarcContextEvent(LarcContextEventType.CARDS)
         await self._fire_listeners(event)
 
     async def clear_cards(self) -> None:
-        self._cards = []
+        self._cards = LarcSnapshot((), self._cards.version + 1)
 
         event = LarcContextEvent(LarcContextEventType.CARDS)
         await self._fire_listeners(event)
@@ -128,11 +188,20 @@ class LarcContext:
         if self._error:
             await self._fire_listeners(LarcContextEvent(type_=LarcContextEventType.ERROR))
 
+    @asynccontextmanager
+    async def transaction(self):
+        self._transaction_depth += 1
+        try:
+            yield self
+        finally:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0 and len(self._transaction_events) > 0:
+                events, self._transaction_events = self._transaction_events, []
+                await self._fire_listeners(LarcContextEvent(LarcContextEventType.BATCH, events))
+
     async def _fire_listeners(self, event: LarcContextEvent):
-        values = [*self._listeners.values()]
-        for listener in values:
-            try:
-                if listener:
-                    await listener(event)
-            except Exception as e:
-                print(e)
+        if self._transaction_depth > 0:
+            self._transaction_events.append(event)
+            return
+
+        await self._dispatcher.publish(event)
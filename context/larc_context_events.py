@@ -0,0 +1,51 @@
+import enum
+from typing import List, Dict, Tuple
+
+
+class LarcContextEventType(enum.Enum):
+    NEW_MESSAGE = 0
+    USERS = 1
+    ERROR = 2
+    PLAYERS = 3
+    CARDS = 4
+    BATCH = 5
+
+
+class LarcContextEvent:
+
+    def __init__(self, type_: LarcContextEventType, data=None):
+        self.type_ = type_
+        self.data = data
+
+
+class LarcContextDiff:
+
+    def __init__(self, added: List[int] = None, removed: List[int] = None, updated: List[int] = None):
+        self.added: List[int] = added or []
+        self.removed: List[int] = removed or []
+        self.updated: List[int] = updated or []
+
+    @property
+    def empty(self) -> bool:
+        return len(self.added) == 0 and len(self.removed) == 0 and len(self.updated) == 0
+
+    @staticmethod
+    def between(previous: Dict[int, Tuple], current: Dict[int, Tuple]) -> 'LarcContextDiff':
+        diff = LarcContextDiff()
+        for id_, row in current.items():
+            previous_row = previous.get(id_)
+            if previous_row is None:
+                diff.added.append(id_)
+            elif previous_row != row:
+                diff.updated.append(id_)
+        diff.removed = [id_ for id_ in previous if id_ not in current]
+        return diff
+
+    def merge(self, other: 'LarcContextDiff') -> 'LarcContextDiff':
+        added, removed, updated = set(self.added), set(self.removed), set(self.updated)
+        other_added, other_removed, other_updated = set(other.added), set(other.removed), set(other.updated)
+        merged_added = (added - other_removed) | (other_added - removed)
+        merged_removed = (removed - other_added) | (other_removed - added)
+        # removed and then added again is just an update for whoever sees both changes at once
+        merged_updated = (updated | other_updated | (removed & other_added)) - merged_added - merged_removed
+        return LarcContextDiff(sorted(merged_added), sorted(merged_removed), sorted(merged_updated))
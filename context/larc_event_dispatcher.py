@@ -0,0 +1,212 @@
+import asyncio
+import enum
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple, Iterable, FrozenSet
+
+from context.larc_context_events import LarcContextEvent, LarcContextEventType, LarcContextDiff
+
+
+class LarcOverflowPolicy(enum.Enum):
+    DROP_OLDEST = 0
+    COALESCE = 1
+    BLOCK = 2
+
+
+class LarcEventFilter:
+
+    def __init__(self, event_types: Iterable[LarcContextEventType] = None, user_id: int = None):
+        self._event_types: Optional[FrozenSet[LarcContextEventType]] = \
+            frozenset(event_types) if event_types is not None else None
+        self._user_id = user_id
+
+    def apply(self, event: LarcContextEvent) -> Optional[LarcContextEvent]:
+        if event.type_ == LarcContextEventType.BATCH:
+            events = [event_ for event_ in event.data if self._matches(event_)]
+            if len(events) == 0:
+                return None
+            if len(events) == len(event.data):
+                return event
+            return LarcContextEvent(LarcContextEventType.BATCH, events)
+        return event if self._matches(event) else None
+
+    def _matches(self, event: LarcContextEvent) -> bool:
+        if self._event_types is not None and event.type_ not in self._event_types:
+            return False
+
+        if self._user_id is not None:
+            if event.type_ == LarcContextEventType.NEW_MESSAGE:
+                return event.data.user_id == self._user_id
+            if isinstance(event.data, LarcContextDiff):
+                return self._user_id in event.data.added \
+                    or self._user_id in event.data.removed \
+                    or self._user_id in event.data.updated
+        return True
+
+
+class LarcSubscriberStats:
+
+    def __init__(self):
+        self.queued = 0
+        self.max_queued = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+
+class LarcSubscriber:
+
+    def __init__(self, listener: Callable, max_size: int, policy: LarcOverflowPolicy, event_filter: LarcEventFilter):
+        self._listener = listener
+        self._filter = event_filter
+        self._max_size = max(1, max_size)
+        self._policy = policy
+        self._queue: Deque[Tuple[float, LarcContextEvent]] = deque()
+        # NEW_MESSAGE events in the queue, including the ones inside queued batches
+        self._queued_messages = 0
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self._task: asyncio.Task = None
+        self.stats = LarcSubscriberStats()
+
+    async def put(self, event: LarcContextEvent) -> None:
+        event = self._filter.apply(event)
+        if event is None:
+            return
+
+        loop = asyncio.get_running_loop()
+        if self._task is None:
+            self._task = loop.create_task(self._run())
+
+        messages = self._count_messages(event)
+        if self._policy == LarcOverflowPolicy.COALESCE:
+            # state events fold into queued ones of the same type, so only messages take room, and they are never
+            # dropped: the producer waits instead, which also stops draining the server until the listener catches up
+            while messages > 0 and len(self._queue) > 0 and self._queued_messages + messages > self._max_size:
+                self._not_full.clear()
+                await self._not_full.wait()
+            if self._coalesce(event):
+                self._queued_messages += messages
+                return
+        else:
+            while len(self._queue) >= self._max_size:
+                if self._policy == LarcOverflowPolicy.BLOCK:
+                    self._not_full.clear()
+                    await self._not_full.wait()
+                else:
+                    _, dropped = self._queue.popleft()
+                    self._queued_messages -= self._count_messages(dropped)
+                    self.stats.dropped += 1
+
+        self._queue.append((loop.time(), event))
+        self._queued_messages += messages
+        self._not_empty.set()
+        self.stats.queued = len(self._queue)
+        self.stats.max_queued = max(self.stats.max_queued, self.stats.queued)
+
+    def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._queue.clear()
+        self._queued_messages = 0
+        self._not_full.set()
+
+    def _coalesce(self, event: LarcContextEvent) -> bool:
+        for idx in range(len(self._queue) - 1, -1, -1):
+            queued_at, queued = self._queue[idx]
+            if queued.type_ != event.type_:
+                continue
+
+            merged = self._merge(queued, event)
+            if merged is None:
+                return False
+            # the merged event keeps the age of the oldest one so the lag stays honest
+            self._queue[idx] = (queued_at, merged)
+            self.stats.coalesced += 1
+            return True
+        return False
+
+    @staticmethod
+    def _count_messages(event: LarcContextEvent) -> int:
+        if event.type_ == LarcContextEventType.BATCH:
+            return sum(1 for event_ in event.data if event_.type_ == LarcContextEventType.NEW_MESSAGE)
+        return 1 if event.type_ == LarcContextEventType.NEW_MESSAGE else 0
+
+    @staticmethod
+    def _merge(queued: LarcContextEvent, event: LarcContextEvent) -> Optional[LarcContextEvent]:
+        if event.type_ == LarcContextEventType.NEW_MESSAGE:
+            # every message must reach the listener
+            return None
+        if event.type_ == LarcContextEventType.BATCH:
+            return LarcContextEvent(event.type_, LarcSubscriber._fold(queued.data, event.data))
+        if queued.data is not None and event.data is not None and hasattr(queued.data, 'merge'):
+            return LarcContextEvent(event.type_, queued.data.merge(event.data))
+        return event
+
+    @staticmethod
+    def _fold(queued: List[LarcContextEvent], events: List[LarcContextEvent]) -> List[LarcContextEvent]:
+        # a merged batch keeps every message but a single event of each other type, so it can't grow without bound
+        folded = [*queued]
+        positions = {event.type_: idx for idx, event in enumerate(folded)}
+        for event in events:
+            idx = positions.get(event.type_) if event.type_ != LarcContextEventType.NEW_MESSAGE else None
+            if idx is None:
+                positions[event.type_] = len(folded)
+                folded.append(event)
+            else:
+                folded[idx] = LarcSubscriber._merge(folded[idx], event)
+        return folded
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            while len(self._queue) == 0:
+                self._not_empty.clear()
+                await self._not_empty.wait()
+
+            queued_at, event = self._queue.popleft()
+            self._queued_messages -= self._count_messages(event)
+            self._not_full.set()
+            self.stats.queued = len(self._queue)
+            self.stats.last_lag = loop.time() - queued_at
+            self.stats.max_lag = max(self.stats.max_lag, self.stats.last_lag)
+            try:
+                await self._listener(event)
+            except Exception as e:
+                print(e)
+            self.stats.delivered += 1
+
+
+class LarcEventDispatcher:
+
+    def __init__(self):
+        self._subscribers: Dict[str, LarcSubscriber] = dict()
+
+    def subscribe(
+            self,
+            id_: str,
+            listener: Callable,
+            max_size: int,
+            policy: LarcOverflowPolicy,
+            event_filter: LarcEventFilter = None,
+    ) -> None:
+        self._subscribers[id_] = LarcSubscriber(
+            listener,
+            max_size=max_size,
+            policy=policy,
+            event_filter=event_filter or LarcEventFilter(),
+        )
+
+    def unsubscribe(self, id_: str) -> None:
+        subscriber = self._subscribers.pop(id_)
+        subscriber.close()
+
+    def stats(self) -> Dict[str, LarcSubscriberStats]:
+        return {id_: subscriber.stats for id_, subscriber in self._subscribers.items()}
+
+    async def publish(self, event: LarcContextEvent) -> None:
+        for subscriber in [*self._subscribers.values()]:
+            await subscriber.put(event)
@@ -0,0 +1,75 @@
+from bisect import bisect_left
+from typing import Callable, Dict, Generic, Iterable, Iterator, List, Optional, TypeVar, Union
+
+from context.larc_snapshot import LarcSnapshot
+
+T = TypeVar('T')
+
+
+class LarcIndexedStore(Generic[T]):
+    # above this share of changed ids a full rebuild is cheaper than patching the sorted view
+    _REBUILD_RATIO = 0.25
+
+    def __init__(self, key: Callable[[T], int]):
+        self._key = key
+        self._by_id: Dict[int, T] = {}
+        self._ids: List[int] = []
+        self._items: List[T] = []
+        self._version = 0
+        self._snapshot: LarcSnapshot[T] = LarcSnapshot()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items)
+
+    def __contains__(self, id_: int) -> bool:
+        return id_ in self._by_id
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def snapshot(self) -> LarcSnapshot[T]:
+        # built once per version, every reader until the next update shares it
+        if self._snapshot.version != self._version:
+            self._snapshot = LarcSnapshot(tuple(self._items), self._version)
+        return self._snapshot
+
+    def get(self, id_: int) -> Optional[T]:
+        return self._by_id.get(id_)
+
+    def update(self, items: Iterable[T], added: Iterable[int], removed: Iterable[int], updated: Iterable[int]):
+        current = {self._key(item): item for item in items}
+        added, removed, updated = list(added), list(removed), list(updated)
+        self._version += 1
+        if len(added) + len(removed) + len(updated) > len(current) * self._REBUILD_RATIO:
+            self.replace(current)
+            return
+
+        for id_ in removed:
+            del self._by_id[id_]
+            idx = bisect_left(self._ids, id_)
+            del self._ids[idx]
+            del self._items[idx]
+
+        for id_ in updated:
+            item = current[id_]
+            self._by_id[id_] = item
+            self._items[bisect_left(self._ids, id_)] = item
+
+        for id_ in added:
+            item = current[id_]
+            self._by_id[id_] = item
+            idx = bisect_left(self._ids, id_)
+            self._ids.insert(idx, id_)
+            self._items.insert(idx, item)
+
+    def replace(self, current: Union[Dict[int, T], Iterable[T]]) -> None:
+        if not isinstance(current, dict):
+            current = {self._key(item): item for item in current}
+        self._version += 1
+        self._by_id = dict(current)
+        self._ids = sorted(self._by_id)
+        self._items = [self._by_id[id_] for id_ in self._ids]
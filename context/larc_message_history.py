@@ -0,0 +1,146 @@
+import asyncio
+import json
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, Deque, Iterator, List, Optional, Tuple, Union
+
+from config import LARC_MESSAGES_HISTORY_SIZE, LARC_MESSAGES_SPILL_PATH, LARC_MESSAGES_SPILL_WORKERS
+from context.larc_snapshot import LarcSnapshot, LarcWindowSnapshot
+from model.larc_models import LarcSentMessage, LarcReceivedMessage
+
+LarcHistoryMessage = Union[LarcSentMessage, LarcReceivedMessage]
+
+# every history in the process shares these threads, a fleet of sessions doesn't cost one thread per account
+_spill_executor = ThreadPoolExecutor(max_workers=max(1, LARC_MESSAGES_SPILL_WORKERS), thread_name_prefix='larc-spill')
+
+
+class LarcMessageHistory:
+
+    def __init__(self, capacity: int = LARC_MESSAGES_HISTORY_SIZE, spill_path: Optional[str] = LARC_MESSAGES_SPILL_PATH):
+        if capacity <= 0:
+            raise RuntimeError('The message history capacity must be greater than zero.')
+
+        self._capacity = capacity
+        # append-only, the oldest resident message is at `_first` and the slots before it were already spilled
+        self._items: List[LarcHistoryMessage] = []
+        self._first = 0
+        self._appended = 0
+        self._spill_path = spill_path or None
+        self._spill_file = None
+        # the spill log jobs of this history, run one at a time and in order on the shared executor
+        self._spill_jobs: Deque[Tuple[Future, Callable, Tuple]] = deque()
+        self._spill_lock = threading.Lock()
+        self._spill_running = False
+        self._spilled = 0
+        self._snapshot: LarcSnapshot[LarcHistoryMessage] = LarcSnapshot()
+
+    def __len__(self) -> int:
+        return len(self._items) - self._first
+
+    def __iter__(self) -> Iterator[LarcHistoryMessage]:
+        return islice(self._items, self._first, len(self._items))
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def version(self) -> int:
+        return self._appended
+
+    def append(self, message: LarcHistoryMessage) -> None:
+        self._items.append(message)
+        if len(self._items) - self._first > self._capacity:
+            self._spill(self._items[self._first])
+            self._first += 1
+            if self._first == self._capacity:
+                # compacted once per `capacity` appends, snapshots keep the old list, which is never written again
+                self._items = self._items[self._first:]
+                self._first = 0
+        self._appended += 1
+
+    def tail(self, count: int, offset: int = 0) -> List[LarcHistoryMessage]:
+        # up to `count` messages in chronological order, skipping the `offset` newest ones
+        end = max(self._first, len(self._items) - offset)
+        begin = max(self._first, end - count)
+        return self._items[begin:end]
+
+    def snapshot(self) -> LarcSnapshot[LarcHistoryMessage]:
+        # a window over the shared list, so a read after every append costs no copy
+        if self._snapshot.version != self._appended:
+            self._snapshot = LarcWindowSnapshot(self._items, self._first, len(self._items), self._appended)
+        return self._snapshot
+
+    async def search(self, text: str) -> List[LarcHistoryMessage]:
+        text = text.lower()
+        resident = [message for message in self if text in (message.data or '').lower()]
+        if self._spilled == 0:
+            return resident
+
+        # only the lines spilled so far are read, the ones spilled meanwhile were matched as resident messages
+        spilled = await asyncio.wrap_future(self._submit_spill_job(self._search_spilled, text, self._spilled))
+        return spilled + resident
+
+    def close(self) -> None:
+        if self._spilled > 0:
+            # the queued writes and the close still run in order on the executor, nothing waits for them here
+            self._submit_spill_job(self._close_spill_file)
+
+    def _spill(self, message: LarcHistoryMessage) -> None:
+        if self._spill_path is None:
+            return
+        kind = 'R' if isinstance(message, LarcReceivedMessage) else 'S'
+        line = json.dumps([kind, message.user_id, message.data], ensure_ascii=False) + '\n'
+        self._submit_spill_job(self._write_spilled, line)
+        self._spilled += 1
+
+    def _submit_spill_job(self, job: Callable, *args) -> Future:
+        future = Future()
+        with self._spill_lock:
+            self._spill_jobs.append((future, job, args))
+            start, self._spill_running = not self._spill_running, True
+        if start:
+            _spill_executor.submit(self._run_spill_jobs)
+        return future
+
+    def _run_spill_jobs(self) -> None:
+        while True:
+            with self._spill_lock:
+                if len(self._spill_jobs) == 0:
+                    self._spill_running = False
+                    return
+                future, job, args = self._spill_jobs.popleft()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(job(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def _write_spilled(self, line: str) -> None:
+        if self._spill_file is None:
+            # every history starts a fresh log, so a search never returns messages of an earlier run
+            self._spill_file = open(self._spill_path, 'w', encoding='utf-8')
+        self._spill_file.write(line)
+
+    def _close_spill_file(self) -> None:
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def _search_spilled(self, text: str, count: int) -> List[LarcHistoryMessage]:
+        if self._spill_file is None:
+            return []
+        self._spill_file.flush()
+        found: List[LarcHistoryMessage] = []
+        with open(self._spill_path, 'r', encoding='utf-8') as spill_file:
+            for line in islice(spill_file, count):
+                kind, user_id, data = json.loads(line)
+                if text in (data or '').lower():
+                    if kind == 'R':
+                        found.append(LarcReceivedMessage(user_id=user_id, data=data))
+                    else:
+                        found.append(LarcSentMessage(user_id=user_id, data=data))
+        return found
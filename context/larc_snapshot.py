@@ -0,0 +1,65 @@
+from itertools import islice
+from typing import Generic, Iterator, List, Sequence, Tuple, TypeVar, Union, overload
+
+T = TypeVar('T')
+
+
+class LarcSnapshot(Sequence, Generic[T]):
+    __slots__ = ('_items', '_version')
+
+    def __init__(self, items: Tuple[T, ...] = (), version: int = 0):
+        self._items: Tuple[T, ...] = items
+        self._version = version
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Tuple[T, ...]: ...
+
+    def __getitem__(self, index: Union[int, slice]):
+        return self._items[index]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items)
+
+    def __reversed__(self) -> Iterator[T]:
+        return reversed(self._items)
+
+    def __repr__(self):
+        return f'LarcSnapshot(version={self._version}, items={self._items!r})'
+
+
+class LarcWindowSnapshot(LarcSnapshot[T]):
+    __slots__ = ('_begin', '_end')
+
+    def __init__(self, items: List[T], begin: int, end: int, version: int = 0):
+        # the list is shared, not copied, its owner only ever appends past `end`, so the window never changes
+        super(LarcWindowSnapshot, self).__init__(items, version)
+        self._begin = begin
+        self._end = end
+
+    def __getitem__(self, index: Union[int, slice]):
+        indices = range(self._begin, self._end)[index]
+        if isinstance(index, slice):
+            return tuple(self._items[i] for i in indices)
+        return self._items[indices]
+
+    def __len__(self) -> int:
+        return self._end - self._begin
+
+    def __iter__(self) -> Iterator[T]:
+        return islice(self._items, self._begin, self._end)
+
+    def __reversed__(self) -> Iterator[T]:
+        return (self._items[i] for i in range(self._end - 1, self._begin - 1, -1))
+
+    def __repr__(self):
+        return f'LarcWindowSnapshot(version={self._version}, items={tuple(self)!r})'
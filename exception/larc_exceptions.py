@@ -7,3 +7,14 @@ class LarcInvalidCredentials(Exception):
         if self.message:
             return self.message
         return super(LarcInvalidCredentials, self).__str__()
+
+
+class LarcTimeout(Exception):
+
+    def __init__(self, message: str):
+        self.message = message
+
+    def __str__(self):
+        if self.message:
+            return self.message
+        return super(LarcTimeout, self).__str__()
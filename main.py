@@ -1,6 +1,7 @@
 import asyncio
 import curses
 
+from tasks.larc_poll_scheduler import LarcPollScheduler
 from tasks.larc_update_messages_task import LarcUpdateMessagesTask
 from tasks.larc_update_players_task import LarcUpdatePlayersTask
 from tasks.larc_update_users_task import LarcUpdateUsersTask
@@ -8,14 +9,12 @@ from ui.menu_ui import MenuUI
 
 
 async def main():
-    update_task = LarcUpdateUsersTask()
-    update_task.start()
-
-    update_messages = LarcUpdateMessagesTask()
-    update_messages.start()
-
-    update_players = LarcUpdatePlayersTask()
-    update_players.start()
+    scheduler = LarcPollScheduler(tasks=[
+        LarcUpdateUsersTask(),
+        LarcUpdateMessagesTask(),
+        LarcUpdatePlayersTask(),
+    ])
+    scheduler.start()
 
     menu = MenuUI()
     await menu.show()
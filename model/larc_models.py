@@ -2,6 +2,7 @@ import enum
 
 
 class LarcUser:
+    __slots__ = ('id_', 'name', 'victories')
 
     def __init__(self, id_: int, name: str, victories: int):
         self.id_: int = id_
@@ -10,6 +11,7 @@ class LarcUser:
 
 
 class LarcMessage:
+    __slots__ = ('user_id', 'data')
 
     def __init__(self, user_id: int = None, data: str = None):
         self.user_id = user_id
@@ -21,39 +23,43 @@ class LarcMessage:
 
 
 class LarcSentMessage(LarcMessage):
+    __slots__ = ()
 
     def __init__(self, user_id: int = None, data: str = None):
         super(LarcSentMessage, self).__init__(user_id, data)
 
 
 class LarcReceivedMessage(LarcMessage):
+    __slots__ = ()
 
     def __init__(self, user_id: int = None, data: str = None):
         super(LarcReceivedMessage, self).__init__(user_id, data)
 
 
-class LarcPlayerStatus(enum.Enum):
-    IDLE = 'IDLE'
-    PLAYING = 'PLAYING'
-    GETTING = 'GETTING'
-    WAITING = 'WAITING'
+class LarcPlayerStatus(enum.IntEnum):
+    IDLE = 0
+    PLAYING = 1
+    GETTING = 2
+    WAITING = 3
 
 
 class LarcPlayer:
+    __slots__ = ('user_id', 'status')
 
     def __init__(self, user_id: int, status: LarcPlayerStatus):
         self.user_id = user_id
         self.status = status
 
 
-class LarcCardSuit(enum.Enum):
-    CLUB = 'CLUB'
-    HEART = 'HEART'
-    DIAMOND = 'DIAMOND'
-    SPADE = 'SPADE'
+class LarcCardSuit(enum.IntEnum):
+    CLUB = 0
+    HEART = 1
+    DIAMOND = 2
+    SPADE = 3
 
 
 class LarcCard:
+    __slots__ = ('value', 'suit')
 
     def __init__(self, value: str, suit: LarcCardSuit):
         self.value = value
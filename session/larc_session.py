@@ -0,0 +1,72 @@
+import os
+from typing import List, Optional
+
+from config import LARC_MESSAGES_SPILL_PATH
+from connection.larc_connection import LarcConnection
+from connection.larc_messages import LarcCredentials
+from context.larc_context import LarcContext
+from tasks.larc_base_task import LarcBaseTask
+from tasks.larc_poll_scheduler import LarcPollScheduler
+from tasks.larc_update_messages_task import LarcUpdateMessagesTask
+from tasks.larc_update_players_task import LarcUpdatePlayersTask
+from tasks.larc_update_users_task import LarcUpdateUsersTask
+
+
+def session_spill_path(user_id: int, spill_path: Optional[str] = LARC_MESSAGES_SPILL_PATH) -> Optional[str]:
+    if not spill_path:
+        return None
+    # every account spills to its own file, "larc_messages.log" becomes "larc_messages_<user id>.log"
+    root, ext = os.path.splitext(spill_path)
+    return f'{root}_{user_id}{ext}'
+
+
+class LarcSession:
+
+    def __init__(
+            self,
+            credentials: LarcCredentials,
+            connection: LarcConnection = None,
+            spill_path: Optional[str] = LARC_MESSAGES_SPILL_PATH,
+    ):
+        self._connection = connection or LarcConnection()
+        self._context = LarcContext(
+            credentials=credentials,
+            connection=self._connection,
+            spill_path=session_spill_path(credentials.user_id, spill_path),
+        )
+        self._tasks: List[LarcBaseTask] = [
+            LarcUpdateUsersTask(context=self._context),
+            LarcUpdateMessagesTask(context=self._context),
+            LarcUpdatePlayersTask(context=self._context),
+        ]
+        self._scheduler: LarcPollScheduler = None
+
+    @property
+    def credentials(self) -> LarcCredentials:
+        return self._context.credentials
+
+    @property
+    def context(self) -> LarcContext:
+        return self._context
+
+    @property
+    def connection(self) -> LarcConnection:
+        return self._connection
+
+    @property
+    def tasks(self) -> List[LarcBaseTask]:
+        return [*self._tasks]
+
+    def attach(self, scheduler: LarcPollScheduler) -> None:
+        if self._scheduler is not None:
+            raise RuntimeError('The session is already attached to a scheduler.')
+        self._scheduler = scheduler
+        scheduler.add(self._tasks)
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.stop()
+        if self._scheduler is not None:
+            self._scheduler.remove(self._tasks)
+            self._scheduler = None
+        await self._context.close()
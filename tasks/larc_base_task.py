@@ -1,15 +1,61 @@
 import asyncio
+import random
 from abc import ABC, abstractmethod
 
+from config import LARC_MIN_REFRESH_TIMEOUT, LARC_ERROR_MAX_REFRESH_TIMEOUT
 from context.larc_context import LarcContext
 
 
 class LarcBaseTask(ABC):
+    _SHRINK_FACTOR = 0.5
+    _GROWTH_FACTOR = 1.5
 
-    def __init__(self, interval):
-        self._context: LarcContext = LarcContext.instance()
+    def __init__(self, interval, max_interval=None, min_interval=LARC_MIN_REFRESH_TIMEOUT, context: LarcContext = None):
+        self._context: LarcContext = context or LarcContext.instance()
         self._stopped = False
+        self._base_interval = interval
+        self._min_interval = min(min_interval, interval)
+        self._max_interval = max(max_interval or interval, interval)
         self._interval = interval
+        self._errors = 0
+        self._next_run = 0.0
+
+    @property
+    def context(self) -> LarcContext:
+        return self._context
+
+    @property
+    def interval(self) -> float:
+        return self._interval
+
+    @property
+    def next_run(self) -> float:
+        return self._next_run
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped
+
+    def is_due(self, now: float) -> bool:
+        return not self._stopped and now >= self._next_run
+
+    def schedule(self, now: float) -> None:
+        self._next_run = now + self._interval
+
+    def on_success(self, changed: bool) -> None:
+        if self._errors > 0:
+            self._errors = 0
+            self._interval = self._base_interval
+
+        if changed:
+            self._interval = max(self._min_interval, self._interval * self._SHRINK_FACTOR)
+        else:
+            self._interval = min(self._max_interval, self._interval * self._GROWTH_FACTOR)
+
+    def on_error(self) -> None:
+        self._errors += 1
+        backoff = min(LARC_ERROR_MAX_REFRESH_TIMEOUT, self._base_interval * 2 ** self._errors)
+        self._interval = random.uniform(backoff / 2, backoff)
 
     def start(self):
         loop = asyncio.get_event_loop()
@@ -19,13 +65,25 @@ class LarcBaseTask(ABC):
         self._stopped = True
 
     async def _loop(self):
+        loop = asyncio.get_running_loop()
         while not self._stopped:
+            now = loop.time()
             try:
-                await self._run()
+                self.on_success(await self._run())
             except Exception as e:
+                self.on_error()
                 await self._context.set_error(e)
-            await asyncio.sleep(self._interval)
+            self.schedule(now)
+            await asyncio.sleep(max(0.0, self._next_run - loop.time()))
+
+    async def _run(self) -> bool:
+        result = await self.fetch()
+        return await self.apply(result)
+
+    @abstractmethod
+    async def fetch(self):
+        pass
 
     @abstractmethod
-    async def _run(self):
+    async def apply(self, result) -> bool:
         pass
@@ -0,0 +1,81 @@
+import asyncio
+from typing import Dict, Iterable, List
+
+from context.larc_context import LarcContext
+from tasks.larc_base_task import LarcBaseTask
+
+
+class LarcPollScheduler:
+    # tasks due within this window join the current tick, so adaptive intervals don't split the batch
+    _COALESCE_WINDOW = 0.2
+
+    def __init__(self, tasks: Iterable[LarcBaseTask] = ()):
+        self._tasks: List[LarcBaseTask] = [*tasks]
+        self._stopped = False
+        self._wakeup = asyncio.Event()
+        self._running: Dict[LarcContext, asyncio.Task] = {}
+
+    @property
+    def tasks(self) -> List[LarcBaseTask]:
+        return [*self._tasks]
+
+    def add(self, tasks: Iterable[LarcBaseTask]) -> None:
+        self._tasks.extend(tasks)
+        self._wakeup.set()
+
+    def remove(self, tasks: Iterable[LarcBaseTask]) -> None:
+        removed = set(tasks)
+        self._tasks = [task for task in self._tasks if task not in removed]
+
+    def start(self):
+        loop = asyncio.get_event_loop()
+        loop.create_task(self._loop())
+
+    def stop(self):
+        self._stopped = True
+        self._wakeup.set()
+
+    async def _loop(self):
+        loop = asyncio.get_running_loop()
+        while not self._stopped:
+            now = loop.time()
+            due: Dict[LarcContext, List[LarcBaseTask]] = {}
+            for task in self._tasks:
+                # a session still waiting on its previous poll is skipped until that poll is applied
+                if task.context not in self._running and task.is_due(now + self._COALESCE_WINDOW):
+                    due.setdefault(task.context, []).append(task)
+
+            for context, tasks in due.items():
+                # every session polls on its own, so a stalled one never holds back the results of the others
+                poll = loop.create_task(self._poll(context, tasks, now))
+                self._running[context] = poll
+                poll.add_done_callback(lambda _, polled=context: self._on_poll_done(polled))
+
+            pending = [task.next_run for task in self._tasks if not task.stopped and task.context not in self._running]
+            # tasks added while sleeping wake the loop up instead of waiting for the current timeout
+            self._wakeup.clear()
+            try:
+                timeout = max(0.0, min(pending) - loop.time()) if len(pending) > 0 else None
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _on_poll_done(self, context: LarcContext) -> None:
+        self._running.pop(context, None)
+        self._wakeup.set()
+
+    async def _poll(self, context: LarcContext, tasks: List[LarcBaseTask], now: float):
+        # every query of the session goes out at once, so over a pipelined connection they cost a single round trip
+        results = await asyncio.gather(*[task.fetch() for task in tasks], return_exceptions=True)
+
+        # each session still sees a single batch event per tick
+        async with context.transaction():
+            for task, result in zip(tasks, results):
+                try:
+                    if isinstance(result, BaseException):
+                        raise result
+                    task.on_success(await task.apply(result))
+                except Exception as e:
+                    task.on_error()
+                    await context.set_error(e)
+                task.schedule(now)
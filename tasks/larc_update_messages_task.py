@@ -1,19 +1,80 @@
-from config import LARC_MESSAGES_REFRESH_TIMEOUT
+import asyncio
+from typing import List
+
+from config import LARC_MESSAGES_REFRESH_TIMEOUT, LARC_MESSAGES_MAX_REFRESH_TIMEOUT, LARC_MESSAGES_MAX_BURST, \
+    LARC_MESSAGES_DRAIN_WINDOW
 from connection.larc_messages import LarcGetMessage
-from model.larc_models import LarcSentMessage
+from context.larc_context import LarcContext
+from model.larc_models import LarcReceivedMessage
 from tasks.larc_base_task import LarcBaseTask
 
 
 class LarcUpdateMessagesTask(LarcBaseTask):
 
-    def __init__(self):
-        super(LarcUpdateMessagesTask, self).__init__(interval=LARC_MESSAGES_REFRESH_TIMEOUT)
-
-    async def _run(self):
-        get_message = LarcGetMessage(
+    def __init__(
+            self,
+            max_burst: int = LARC_MESSAGES_MAX_BURST,
+            drain_window: int = LARC_MESSAGES_DRAIN_WINDOW,
+            context: LarcContext = None,
+    ):
+        super(LarcUpdateMessagesTask, self).__init__(
+            interval=LARC_MESSAGES_REFRESH_TIMEOUT,
+            max_interval=LARC_MESSAGES_MAX_REFRESH_TIMEOUT,
+            context=context,
+        )
+        self._max_burst = max(1, max_burst)
+        self._drain_window = max(1, drain_window)
+        self._backlog = False
+        self._fetch_error: BaseException = None
+        # GET MESSAGE carries no state between calls, so the whole pipelined window shares one request
+        self._get_message_request = LarcGetMessage(
             connection=self._context.connection,
             credentials=self._context.credentials,
         )
-        message: LarcSentMessage = await get_message.execute()
-        if message and not message.empty:
+
+    def schedule(self, now: float) -> None:
+        if self._backlog:
+            # the burst limit was hit, so the rest of the backlog is fetched on the next tick
+            self._next_run = now
+        else:
+            super(LarcUpdateMessagesTask, self).schedule(now)
+
+    async def fetch(self) -> List[LarcReceivedMessage]:
+        window = self._drain_window if self._context.connection.pipelining else 1
+        messages: List[LarcReceivedMessage] = []
+        requested = 0
+        drained = False
+        error: BaseException = None
+        # a single request while idle; the pipelined window is only used once there is something to drain
+        size = 1
+        while not drained and error is None and requested < self._max_burst:
+            size = min(size, self._max_burst - requested)
+            requested += size
+            responses = await asyncio.gather(*[self._get_message() for _ in range(size)], return_exceptions=True)
+            for message in responses:
+                if isinstance(message, BaseException):
+                    error = error or message
+                elif message and not message.empty:
+                    messages.append(message)
+                else:
+                    drained = True
+            size = window
+
+        # a failed fetch backs off like any other error instead of draining again on the next tick
+        self._backlog = not drained and error is None
+        if error is not None and len(messages) == 0:
+            raise error
+        # the messages already taken off the server queue are applied first, the error is raised after them
+        self._fetch_error = error
+        return messages
+
+    async def apply(self, messages: List[LarcReceivedMessage]) -> bool:
+        error, self._fetch_error = self._fetch_error, None
+        for message in messages:
             await self._context.append_message(message)
+        if error is not None:
+            raise error
+        return len(messages) > 0
+
+    async def _get_message(self) -> LarcReceivedMessage:
+        return await self._get_message_request.execute()
@@ -1,21 +1,31 @@
-from typing import List
+from typing import Tuple
 
-from config import LARC_PLAYERS_REFRESH_TIMEOUT
+from config import LARC_PLAYERS_REFRESH_TIMEOUT, LARC_PLAYERS_MAX_REFRESH_TIMEOUT
 from connection.larc_messages import LarcGetPlayers
+from context.larc_context import LarcContext
 from model.larc_models import LarcPlayer
 from tasks.larc_base_task import LarcBaseTask
 
 
 class LarcUpdatePlayersTask(LarcBaseTask):
 
-    def __init__(self):
-        super(LarcUpdatePlayersTask, self).__init__(interval=LARC_PLAYERS_REFRESH_TIMEOUT)
-
-    async def _run(self):
-        get_players = LarcGetPlayers(
+    def __init__(self, context: LarcContext = None):
+        super(LarcUpdatePlayersTask, self).__init__(
+            interval=LARC_PLAYERS_REFRESH_TIMEOUT,
+            max_interval=LARC_PLAYERS_MAX_REFRESH_TIMEOUT,
+            context=context,
+        )
+        self._get_players = LarcGetPlayers(
             connection=self._context.connection,
             credentials=self._context.credentials,
         )
-        players: List[LarcPlayer] = await get_players.execute()
-        if players:
-            await self._context.set_players(players)
+
+    async def fetch(self) -> Tuple[LarcPlayer, ...]:
+        return await self._get_players.execute()
+
+    async def apply(self, players: Tuple[LarcPlayer, ...]) -> bool:
+        if not players:
+            return False
+
+        diff = await self._context.set_players(players)
+        return diff is not None
@@ -1,21 +1,31 @@
-from typing import List
+from typing import Tuple
 
-from config import LARC_USERS_REFRESH_TIMEOUT
+from config import LARC_USERS_REFRESH_TIMEOUT, LARC_USERS_MAX_REFRESH_TIMEOUT
 from connection.larc_messages import LarcGetUsers
+from context.larc_context import LarcContext
 from model.larc_models import LarcUser
 from tasks.larc_base_task import LarcBaseTask
 
 
 class LarcUpdateUsersTask(LarcBaseTask):
 
-    def __init__(self):
-        super(LarcUpdateUsersTask, self).__init__(interval=LARC_USERS_REFRESH_TIMEOUT)
-
-    async def _run(self):
-        get_users = LarcGetUsers(
+    def __init__(self, context: LarcContext = None):
+        super(LarcUpdateUsersTask, self).__init__(
+            interval=LARC_USERS_REFRESH_TIMEOUT,
+            max_interval=LARC_USERS_MAX_REFRESH_TIMEOUT,
+            context=context,
+        )
+        self._get_users = LarcGetUsers(
             connection=self._context.connection,
             credentials=self._context.credentials,
         )
-        users: List[LarcUser] = await get_users.execute()
-        if users:
-            await self._context.set_users(users)
+
+    async def fetch(self) -> Tuple[LarcUser, ...]:
+        return await self._get_users.execute()
+
+    async def apply(self, users: Tuple[LarcUser, ...]) -> bool:
+        if not users:
+            return False
+
+        diff = await self._context.set_users(users)
+        return diff is not None
@@ -0,0 +1,74 @@
+import asyncio
+import errno
+import unittest
+
+from benchmarks.larc_simulator import LarcSimulator
+from connection.larc_connection import LarcConnection
+from connection.larc_messages import LarcCredentials, LarcGetUsers, LarcGetPlayers
+from exception.larc_exceptions import LarcTimeout
+from model.larc_models import LarcUser, LarcPlayer
+
+
+class LarcConnectionTimeoutTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.simulator = LarcSimulator(users=3, players=3)
+        self.simulator.start()
+        # a single channel, so the late response arrives on the same stream as the requests after it
+        self.connection = LarcConnection(
+            pipelining=True,
+            address=self.simulator.host,
+            tcp_port=self.simulator.tcp_port,
+            udp_port=self.simulator.udp_port,
+            pool_size=1,
+            pool_reserved=0,
+        )
+        credentials = LarcCredentials(user_id=1, user_password='x')
+        self.get_users = LarcGetUsers(connection=self.connection, credentials=credentials)
+        self.get_players = LarcGetPlayers(connection=self.connection, credentials=credentials)
+
+    async def asyncTearDown(self):
+        await self.connection.close()
+
+    def tearDown(self):
+        self.simulator.stop()
+
+    async def test_expired_deadline_raises_larc_timeout(self):
+        self.simulator.latency = 0.3
+
+        with self.assertRaises(LarcTimeout):
+            await self.get_users.execute(timeout=0.1)
+
+    async def test_late_response_is_not_given_to_the_next_request(self):
+        self.simulator.latency = 0.3
+        with self.assertRaises(LarcTimeout):
+            await self.get_users.execute(timeout=0.1)
+
+        self.simulator.latency = 0.0
+        players = await self.get_players.execute()
+
+        self.assertTrue(all(isinstance(player, LarcPlayer) for player in players))
+
+    async def test_timeout_keeps_the_connection_of_other_requests(self):
+        self.simulator.latency = 0.3
+        slow = asyncio.ensure_future(self.get_players.execute(timeout=0.1))
+        await asyncio.sleep(0.01)
+        users = await self.get_users.execute(timeout=2)
+
+        with self.assertRaises(LarcTimeout):
+            await slow
+        self.assertTrue(all(isinstance(user, LarcUser) for user in users))
+        self.assertEqual(1, self.connection.pool_stats.connects)
+
+    async def test_socket_timeout_is_not_reported_as_an_expired_deadline(self):
+        async def _send_tcp(message):
+            raise TimeoutError(errno.ETIMEDOUT, 'Connection timed out')
+
+        self.connection._send_tcp = _send_tcp
+
+        with self.assertRaises(TimeoutError):
+            await self.get_users.execute(timeout=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+
+from connection.larc_messages import LarcCredentials
+from context.larc_context import LarcContext
+from model.larc_models import LarcUser
+
+
+class LarcContextTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.context = LarcContext(credentials=LarcCredentials(user_id=1, user_password='x'), spill_path=None)
+
+    async def test_set_users_reports_the_changed_ids(self):
+        await self.context.set_users((LarcUser(1, 'ana', 0), LarcUser(2, 'bob', 0)))
+
+        diff = await self.context.set_users((LarcUser(2, 'bob', 1), LarcUser(3, 'carl', 0)))
+
+        self.assertEqual(([3], [1], [2]), (diff.added, diff.removed, diff.updated))
+        self.assertEqual([2, 3], [user.id_ for user in self.context.users])
+
+    async def test_set_users_ignores_an_unchanged_snapshot(self):
+        users = (LarcUser(1, 'ana', 0), LarcUser(2, 'bob', 0))
+        await self.context.set_users(users)
+        version = self.context.users.version
+
+        self.assertIsNone(await self.context.set_users(users))
+        self.assertIsNone(await self.context.set_users([LarcUser(2, 'bob', 0), LarcUser(1, 'ana', 0)]))
+        self.assertEqual(version, self.context.users.version)
+
+
+if __name__ == '__main__':
+    unittest.main()
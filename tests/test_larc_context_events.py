@@ -0,0 +1,44 @@
+import unittest
+
+from context.larc_context_events import LarcContextDiff
+
+
+class LarcContextDiffTest(unittest.TestCase):
+
+    @staticmethod
+    def _ids(diff: LarcContextDiff):
+        return diff.added, diff.removed, diff.updated
+
+    def test_between(self):
+        diff = LarcContextDiff.between({1: (1, 'a'), 2: (2, 'a'), 3: (3, 'a')}, {2: (2, 'b'), 3: (3, 'a'), 4: (4, 'a')})
+
+        self.assertEqual(([4], [1], [2]), self._ids(diff))
+
+    def test_merge_keeps_independent_changes(self):
+        merged = LarcContextDiff(added=[1], updated=[2]).merge(LarcContextDiff(removed=[3], updated=[2, 4]))
+
+        self.assertEqual(([1], [3], [2, 4]), self._ids(merged))
+
+    def test_merge_drops_an_id_added_and_then_removed(self):
+        merged = LarcContextDiff(added=[1]).merge(LarcContextDiff(removed=[1]))
+
+        self.assertTrue(merged.empty)
+
+    def test_merge_turns_removed_and_added_again_into_an_update(self):
+        merged = LarcContextDiff(removed=[1]).merge(LarcContextDiff(added=[1]))
+
+        self.assertEqual(([], [], [1]), self._ids(merged))
+
+    def test_merge_reports_an_updated_and_then_removed_id_as_removed(self):
+        merged = LarcContextDiff(updated=[1]).merge(LarcContextDiff(removed=[1]))
+
+        self.assertEqual(([], [1], []), self._ids(merged))
+
+    def test_merge_keeps_an_added_and_then_updated_id_as_added(self):
+        merged = LarcContextDiff(added=[1]).merge(LarcContextDiff(updated=[1]))
+
+        self.assertEqual(([1], [], []), self._ids(merged))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import asyncio
+import unittest
+
+from context.larc_context_events import LarcContextEvent, LarcContextEventType, LarcContextDiff
+from context.larc_event_dispatcher import LarcEventDispatcher, LarcOverflowPolicy
+from model.larc_models import LarcReceivedMessage
+
+
+class LarcEventDispatcherTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.dispatcher = LarcEventDispatcher()
+        self.release = asyncio.Event()
+        self.received = []
+
+        async def _listener(event):
+            self.received.append(event)
+            await self.release.wait()
+
+        self.dispatcher.subscribe('stuck', _listener, max_size=3, policy=LarcOverflowPolicy.COALESCE)
+
+    def tearDown(self):
+        self.dispatcher.unsubscribe('stuck')
+
+    @staticmethod
+    def _message(number: int) -> LarcContextEvent:
+        return LarcContextEvent(LarcContextEventType.NEW_MESSAGE, LarcReceivedMessage(user_id=1, data=str(number)))
+
+    @staticmethod
+    def _users(id_: int) -> LarcContextEvent:
+        return LarcContextEvent(LarcContextEventType.USERS, LarcContextDiff(updated=[id_]))
+
+    def _delivered(self):
+        events = []
+        for event in self.received:
+            events.extend(event.data if event.type_ == LarcContextEventType.BATCH else [event])
+        return events
+
+    async def _settle(self):
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+    async def test_coalesced_batches_stay_bounded(self):
+        for i in range(5000):
+            await self.dispatcher.publish(LarcContextEvent(LarcContextEventType.BATCH, [
+                self._users(i),
+                LarcContextEvent(LarcContextEventType.PLAYERS, LarcContextDiff(updated=[i % 10])),
+            ]))
+
+        queued = self.dispatcher._subscribers['stuck']._queue
+        self.assertLessEqual(sum(len(event.data) for _, event in queued), 2)
+
+        self.release.set()
+        await self._settle()
+        users = [event.data for event in self._delivered() if event.type_ == LarcContextEventType.USERS]
+        self.assertEqual(list(range(5000)), sorted(id_ for diff in users for id_ in diff.updated))
+
+    async def test_messages_wait_for_room_instead_of_being_dropped(self):
+        async def _publish():
+            for i in range(10):
+                await self.dispatcher.publish(self._message(i))
+
+        publisher = asyncio.ensure_future(_publish())
+        await self._settle()
+
+        self.assertFalse(publisher.done())
+        self.assertEqual(3, len(self.dispatcher._subscribers['stuck']._queue))
+
+        self.release.set()
+        await asyncio.wait_for(publisher, 1)
+        await self._settle()
+        self.assertEqual([str(i) for i in range(10)], [event.data.data for event in self._delivered()])
+        self.assertEqual(0, self.dispatcher.stats()['stuck'].dropped)
+
+    async def test_messages_inside_batches_count_toward_the_bound(self):
+        async def _publish():
+            for i in range(10):
+                await self.dispatcher.publish(LarcContextEvent(LarcContextEventType.BATCH, [
+                    self._users(i),
+                    self._message(i),
+                ]))
+
+        publisher = asyncio.ensure_future(_publish())
+        await self._settle()
+
+        self.assertFalse(publisher.done())
+        self.release.set()
+        await asyncio.wait_for(publisher, 1)
+        await self._settle()
+        messages = [event.data.data for event in self._delivered() if event.type_ == LarcContextEventType.NEW_MESSAGE]
+        self.assertEqual([str(i) for i in range(10)], messages)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+from context.larc_indexed_store import LarcIndexedStore
+
+
+class LarcIndexedStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.store = LarcIndexedStore(key=lambda item: item[0])
+        self.store.replace([(id_, 'a') for id_ in range(40, 0, -1)])
+
+    def _check(self, items):
+        expected = sorted(items)
+        self.assertEqual(expected, list(self.store))
+        self.assertEqual(expected, list(self.store.snapshot()))
+        for item in items:
+            self.assertEqual(item, self.store.get(item[0]))
+
+    def test_patches_a_small_change_in_place(self):
+        items = [(id_, 'a') for id_ in range(2, 41) if id_ != 5] + [(4, 'b'), (42, 'a')]
+        items.remove((4, 'a'))
+
+        self.store.update(items, added=[42], removed=[1, 5], updated=[4])
+
+        self._check(items)
+        self.assertNotIn(1, self.store)
+        self.assertNotIn(5, self.store)
+
+    def test_rebuilds_after_a_large_change(self):
+        items = [(id_, 'b') for id_ in range(21, 61)]
+
+        self.store.update(items, added=range(41, 61), removed=range(1, 21), updated=range(21, 41))
+
+        self._check(items)
+
+    def test_every_update_gets_a_new_snapshot_version(self):
+        snapshot = self.store.snapshot()
+
+        self.store.update([(id_, 'a') for id_ in range(1, 42)], added=[41], removed=[], updated=[])
+
+        self.assertEqual(40, len(snapshot))
+        self.assertEqual(41, len(self.store.snapshot()))
+        self.assertGreater(self.store.snapshot().version, snapshot.version)
+
+
+if __name__ == '__main__':
+    unittest.main()
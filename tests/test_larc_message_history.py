@@ -0,0 +1,104 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from context.larc_message_history import LarcMessageHistory
+from model.larc_models import LarcReceivedMessage
+
+
+class LarcMessageHistoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.history = LarcMessageHistory(capacity=4, spill_path=None)
+
+    def _append(self, *numbers: int):
+        for number in numbers:
+            self.history.append(LarcReceivedMessage(user_id=1, data=str(number)))
+
+    @staticmethod
+    def _data(messages):
+        return [message.data for message in messages]
+
+    def test_keeps_the_newest_messages(self):
+        self._append(*range(10))
+
+        self.assertEqual(4, len(self.history))
+        self.assertEqual(['6', '7', '8', '9'], self._data(self.history))
+        self.assertEqual(['7', '8'], self._data(self.history.tail(2, offset=1)))
+        self.assertEqual(['6', '7'], self._data(self.history.tail(5, offset=2)))
+
+    def test_snapshot_does_not_change_after_appends(self):
+        self._append(*range(3))
+        snapshot = self.history.snapshot()
+
+        self._append(*range(3, 20))
+
+        self.assertEqual(['0', '1', '2'], self._data(snapshot))
+        self.assertEqual(['16', '17', '18', '19'], self._data(self.history.snapshot()))
+        self.assertEqual(20, self.history.snapshot().version)
+
+    def test_snapshot_indexing(self):
+        self._append(*range(7))
+        snapshot = self.history.snapshot()
+
+        self.assertEqual('3', snapshot[0].data)
+        self.assertEqual('6', snapshot[-1].data)
+        self.assertEqual(['4', '5'], self._data(snapshot[1:3]))
+        self.assertEqual(['6', '5', '4', '3'], self._data(reversed(snapshot)))
+        with self.assertRaises(IndexError):
+            snapshot[4]
+
+
+class LarcMessageHistorySpillTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.spill_path = os.path.join(self.directory.name, 'larc_messages.log')
+        self.history = LarcMessageHistory(capacity=3, spill_path=self.spill_path)
+
+    def tearDown(self):
+        self.history.close()
+        self.directory.cleanup()
+
+    def _append(self, *texts: str):
+        for text in texts:
+            self.history.append(LarcReceivedMessage(user_id=1, data=text))
+
+    async def test_search_finds_spilled_and_resident_messages(self):
+        self._append('hello 1', 'other', 'hello 2', 'hello 3', 'other', 'HELLO 4')
+
+        found = await self.history.search('hello')
+
+        self.assertEqual(['hello 1', 'hello 2', 'hello 3', 'HELLO 4'], [message.data for message in found])
+
+    async def test_starts_a_fresh_log(self):
+        with open(self.spill_path, 'w', encoding='utf-8') as spill_file:
+            spill_file.write('["R", 1, "hello from an earlier run"]\n')
+
+        self.assertEqual([], await self.history.search('hello'))
+        self._append('a', 'b', 'c', 'hello')
+        self.assertEqual(['hello'], [message.data for message in await self.history.search('hello')])
+        self.assertEqual(['a'], [message.data for message in await self.history.search('a')])
+
+    async def test_histories_share_the_spill_threads(self):
+        histories = [
+            LarcMessageHistory(capacity=2, spill_path=os.path.join(self.directory.name, f'larc_messages_{i}.log'))
+            for i in range(20)
+        ]
+        for i, history in enumerate(histories):
+            for number in range(50):
+                history.append(LarcReceivedMessage(user_id=i, data=f'{i}:{number}'))
+
+        for i, history in enumerate(histories):
+            found = await history.search(f'{i}:')
+            self.assertEqual([f'{i}:{number}' for number in range(50)], [message.data for message in found])
+        spill_threads = [thread for thread in threading.enumerate() if thread.name.startswith('larc-spill')]
+        for history in histories:
+            history.close()
+
+        self.assertLessEqual(len(spill_threads), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+
+from connection.larc_connection import LarcConnection
+from connection.larc_messages import LarcCredentials, LarcGetUsers
+
+
+class LarcGetUsersTest(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = LarcConnection()
+
+    def _get_users(self, user_id: int) -> LarcGetUsers:
+        return LarcGetUsers(connection=self.connection, credentials=LarcCredentials(user_id=user_id, user_password='x'))
+
+    def test_parses_records(self):
+        users = self._get_users(1)._parse_response(b'1:ana:2:2:bob:0')
+
+        self.assertEqual([(1, 'ana', 2), (2, 'bob', 0)], [(user.id_, user.name, user.victories) for user in users])
+
+    def test_sessions_do_not_share_the_previous_payload(self):
+        first, second = self._get_users(1), self._get_users(2)
+        ana = first._parse_response(b'1:ana:2')[0]
+
+        second._parse_response(b'3:carl:5')
+
+        self.assertIs(ana, first._parse_response(b'1:ana:2')[0])
+        self.assertIsNot(ana, second._parse_response(b'1:ana:2')[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import asyncio
+import unittest
+
+from connection.larc_connection import LarcConnection
+from connection.larc_messages import LarcCredentials
+from context.larc_context import LarcContext
+from tasks.larc_base_task import LarcBaseTask
+from tasks.larc_poll_scheduler import LarcPollScheduler
+
+
+class _CountingTask(LarcBaseTask):
+
+    def __init__(self, context: LarcContext, release: asyncio.Event = None):
+        super(_CountingTask, self).__init__(interval=0.05, context=context)
+        self.release = release
+        self.applied = 0
+
+    async def fetch(self):
+        if self.release is not None:
+            await self.release.wait()
+        return True
+
+    async def apply(self, result) -> bool:
+        self.applied += 1
+        return False
+
+
+class LarcPollSchedulerTest(unittest.IsolatedAsyncioTestCase):
+
+    @staticmethod
+    def _context(user_id: int) -> LarcContext:
+        return LarcContext(
+            credentials=LarcCredentials(user_id=user_id, user_password='x'),
+            connection=LarcConnection(),
+            spill_path=None,
+        )
+
+    async def test_stalled_session_does_not_hold_back_the_others(self):
+        release = asyncio.Event()
+        healthy = _CountingTask(self._context(1))
+        stalled = _CountingTask(self._context(2), release=release)
+        scheduler = LarcPollScheduler([healthy, stalled])
+
+        scheduler.start()
+        await asyncio.sleep(0.5)
+        applied = healthy.applied
+        release.set()
+        await asyncio.sleep(0.1)
+        scheduler.stop()
+
+        self.assertGreaterEqual(applied, 5)
+        self.assertGreaterEqual(stalled.applied, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import asyncio
+import errno
+import unittest
+
+from benchmarks.larc_simulator import LarcSimulator
+from connection.larc_tcp_channel import LarcTcpChannel, LarcChannelState
+
+GET_USERS = b'GET USERS 1:x\r\n'
+
+
+class LarcTcpChannelTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.simulator = LarcSimulator(users=2, players=0, latency=0.2)
+        self.simulator.start()
+        self.channel = LarcTcpChannel(self.simulator.host, self.simulator.tcp_port)
+
+    async def asyncTearDown(self):
+        await self.channel.drain(0)
+
+    def tearDown(self):
+        self.simulator.stop()
+
+    async def _request_and_fail(self, fail, idempotent: bool = True) -> bytes:
+        request = asyncio.ensure_future(self.channel.request(GET_USERS, idempotent))
+        await asyncio.sleep(0.05)
+        fail()
+        return await request
+
+    async def test_replays_an_idempotent_request_when_the_server_drops_the_connection(self):
+        response = await self._request_and_fail(self.simulator.drop_connections)
+
+        self.assertTrue(response.startswith(b'1:user_1'))
+        self.assertEqual(1, self.channel.replays)
+        self.assertEqual(2, self.channel.connects)
+
+    async def test_replays_an_idempotent_request_when_keepalive_times_out(self):
+        def _keepalive_timeout():
+            self.channel._reader.set_exception(TimeoutError(errno.ETIMEDOUT, 'Connection timed out'))
+
+        response = await self._request_and_fail(_keepalive_timeout)
+
+        self.assertTrue(response.startswith(b'1:user_1'))
+        self.assertEqual(1, self.channel.replays)
+
+    async def test_does_not_replay_other_requests(self):
+        with self.assertRaises(ConnectionError):
+            await self._request_and_fail(self.simulator.drop_connections, idempotent=False)
+
+        self.assertEqual(0, self.channel.replays)
+        self.assertEqual(LarcChannelState.BROKEN, self.channel.state)
+        self.assertTrue((await self.channel.request(GET_USERS)).startswith(b'1:user_1'))
+        self.assertEqual(LarcChannelState.READY, self.channel.state)
+
+    async def test_does_not_replay_after_close(self):
+        request = asyncio.ensure_future(self.channel.request(GET_USERS, True))
+        await asyncio.sleep(0.05)
+        self.channel.close(ConnectionResetError('The LARC connection was closed.'))
+
+        with self.assertRaises(ConnectionError):
+            await request
+        self.assertEqual(0, self.channel.replays)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import asyncio
+import unittest
+
+from connection.larc_messages import LarcPriority
+from connection.larc_tcp_pool import LarcTcpPool
+
+
+class LarcTcpPoolTest(unittest.IsolatedAsyncioTestCase):
+
+    @staticmethod
+    def _pool(size: int, reserved: int, max_in_flight: int = 1) -> LarcTcpPool:
+        # channels only connect on their first request, so leases can be tested without a server
+        return LarcTcpPool('127.0.0.1', 1, size=size, reserved=reserved, max_in_flight=max_in_flight)
+
+    async def test_background_requests_leave_the_reserved_channel_free(self):
+        pool = self._pool(size=2, reserved=1)
+        background = await pool.acquire(LarcPriority.BACKGROUND)
+        waiting = asyncio.ensure_future(pool.acquire(LarcPriority.BACKGROUND))
+        await asyncio.sleep(0)
+
+        interactive = await pool.acquire(LarcPriority.INTERACTIVE)
+
+        self.assertFalse(waiting.done())
+        self.assertIs(pool.channels[0], background)
+        self.assertIs(pool.channels[1], interactive)
+        pool.release(background)
+        self.assertIs(pool.channels[0], await waiting)
+
+    async def test_interactive_waiters_are_served_first(self):
+        pool = self._pool(size=1, reserved=0)
+        held = await pool.acquire(LarcPriority.BACKGROUND)
+        background = asyncio.ensure_future(pool.acquire(LarcPriority.BACKGROUND))
+        await asyncio.sleep(0)
+        interactive = asyncio.ensure_future(pool.acquire(LarcPriority.INTERACTIVE))
+        await asyncio.sleep(0)
+
+        pool.release(held)
+        await asyncio.sleep(0)
+
+        self.assertTrue(interactive.done())
+        self.assertFalse(background.done())
+        pool.release(interactive.result())
+        await asyncio.sleep(0)
+        self.assertTrue(background.done())
+
+    async def test_cancelled_waiter_does_not_keep_a_lease(self):
+        pool = self._pool(size=1, reserved=0)
+        held = await pool.acquire(LarcPriority.BACKGROUND)
+        waiting = asyncio.ensure_future(pool.acquire(LarcPriority.BACKGROUND))
+        await asyncio.sleep(0)
+
+        waiting.cancel()
+        pool.release(held)
+        await asyncio.sleep(0)
+
+        self.assertEqual(0, pool.stats().in_flight)
+        self.assertEqual(0, pool.stats().waiters)
+
+    async def test_ordered_requests_share_the_first_channel(self):
+        pool = self._pool(size=2, reserved=0, max_in_flight=2)
+        first = await pool.acquire(LarcPriority.BACKGROUND, ordered=True)
+
+        second = await pool.acquire(LarcPriority.BACKGROUND, ordered=True)
+        other = await pool.acquire(LarcPriority.BACKGROUND)
+
+        self.assertIs(pool.channels[0], first)
+        self.assertIs(pool.channels[0], second)
+        self.assertIs(pool.channels[1], other)
+
+    async def test_ordered_waiter_does_not_block_requests_for_other_channels(self):
+        pool = self._pool(size=3, reserved=0)
+        ordered = await pool.acquire(LarcPriority.BACKGROUND, ordered=True)
+        waiting = asyncio.ensure_future(pool.acquire(LarcPriority.BACKGROUND, ordered=True))
+        await asyncio.sleep(0)
+
+        other = await asyncio.wait_for(pool.acquire(LarcPriority.BACKGROUND), 1)
+
+        self.assertIs(pool.channels[1], other)
+        self.assertFalse(waiting.done())
+        pool.release(ordered)
+        self.assertIs(pool.channels[0], await waiting)
+
+    async def test_released_channel_goes_to_the_first_waiter_that_can_use_it(self):
+        pool = self._pool(size=2, reserved=0)
+        ordered = await pool.acquire(LarcPriority.BACKGROUND, ordered=True)
+        other = await pool.acquire(LarcPriority.BACKGROUND)
+        ordered_waiter = asyncio.ensure_future(pool.acquire(LarcPriority.BACKGROUND, ordered=True))
+        await asyncio.sleep(0)
+        background_waiter = asyncio.ensure_future(pool.acquire(LarcPriority.BACKGROUND))
+        await asyncio.sleep(0)
+
+        pool.release(other)
+        await asyncio.sleep(0)
+
+        self.assertFalse(ordered_waiter.done())
+        self.assertIs(pool.channels[1], background_waiter.result())
+        pool.release(ordered)
+        self.assertIs(pool.channels[0], await ordered_waiter)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+from benchmarks.larc_simulator import LarcSimulator
+from connection.larc_messages import LarcCredentials
+from context.larc_context import LarcContext
+from tasks.larc_update_messages_task import LarcUpdateMessagesTask
+
+
+class LarcUpdateMessagesTaskTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.simulator = LarcSimulator(users=3, players=0)
+        self.simulator.start()
+        for i in range(12):
+            self.simulator.respond(f'SEND MESSAGE 2:x:1:message {i}'.encode())
+        self.context = LarcContext(
+            credentials=LarcCredentials(user_id=1, user_password='x'),
+            connection=self.simulator.connection(),
+            spill_path=None,
+        )
+        self.task = LarcUpdateMessagesTask(max_burst=50, drain_window=5, context=self.context)
+
+    async def asyncTearDown(self):
+        await self.context.close()
+
+    def tearDown(self):
+        self.simulator.stop()
+
+    def _fail_request(self, number: int):
+        get_message = self.task._get_message
+        calls = []
+
+        async def _get_message():
+            calls.append(None)
+            if len(calls) == number:
+                raise ConnectionResetError('The LARC server closed the connection.')
+            return await get_message()
+
+        self.task._get_message = _get_message
+
+    async def test_drains_the_whole_backlog(self):
+        messages = await self.task.fetch()
+        self.assertTrue(await self.task.apply(messages))
+
+        self.assertEqual([f'message {i}' for i in range(12)], [message.data for message in messages])
+        self.assertEqual(12, len(self.context.message_history))
+
+    async def test_failed_request_keeps_the_drained_messages(self):
+        self._fail_request(8)
+
+        messages = await self.task.fetch()
+        with self.assertRaises(ConnectionResetError):
+            await self.task.apply(messages)
+
+        delivered = [message.data for message in self.context.message_history]
+        remaining = len(self.simulator._inboxes[1])
+        self.assertEqual(12, len(delivered) + remaining)
+        self.assertEqual([f'message {i}' for i in range(len(delivered))], delivered)
+
+    async def test_failed_fetch_does_not_skip_the_error_backoff(self):
+        self.task = LarcUpdateMessagesTask(max_burst=5, drain_window=5, context=self.context)
+        await self.task.apply(await self.task.fetch())
+        self._fail_request(1)
+
+        with self.assertRaises(ConnectionResetError):
+            await self.task.fetch()
+        self.task.on_error()
+        self.task.schedule(100.0)
+
+        self.assertGreater(self.task.next_run, 100.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import asyncio
+import fcntl
+import json
+import os
+import pty
+import select
+import struct
+import tempfile
+import termios
+import time
+import unittest
+
+UI_LINES = 40
+UI_COLUMNS = 240
+
+
+def _ui_child(directory: str):
+    import curses
+
+    from connection.larc_messages import LarcCredentials
+    from context.larc_context import LarcContext
+    from ui.menu_ui import MenuUI
+
+    fcntl.ioctl(0, termios.TIOCSWINSZ, struct.pack('HHHH', UI_LINES, UI_COLUMNS, 0, 0))
+
+    async def run():
+        context = LarcContext(credentials=LarcCredentials(user_id=1, user_password='x'), spill_path=None)
+        menu = MenuUI(context=context)
+        open(os.path.join(directory, 'ready'), 'w').close()
+
+        select.select([0], [], [])
+        started = time.monotonic()
+        menu._drain_keys()
+        elapsed = time.monotonic() - started
+        curses.endwin()
+        with open(os.path.join(directory, 'result.json'), 'w') as result:
+            json.dump({'elapsed': elapsed, 'keys': [menu._keys.get_nowait() for _ in range(menu._keys.qsize())]}, result)
+
+    try:
+        asyncio.run(run())
+    finally:
+        os._exit(0)
+
+
+class MenuUIKeysTest(unittest.TestCase):
+
+    def test_lone_escape_is_queued_without_blocking(self):
+        with tempfile.TemporaryDirectory() as directory:
+            os.environ['TERM'] = os.environ.get('TERM') or 'xterm-256color'
+            pid, master = pty.fork()
+            if pid == 0:
+                _ui_child(directory)
+
+            # the terminal output is drained so the child never blocks on a full pty
+            written = False
+            deadline = time.monotonic() + 10
+            while time.monotonic() < deadline:
+                readable, _, _ = select.select([master], [], [], 0.05)
+                if master in readable:
+                    try:
+                        if len(os.read(master, 65536)) == 0:
+                            break
+                    except OSError:
+                        break
+                if not written and os.path.exists(os.path.join(directory, 'ready')):
+                    os.write(master, b'\x1b')
+                    written = True
+            os.waitpid(pid, 0)
+            os.close(master)
+
+            with open(os.path.join(directory, 'result.json')) as result:
+                result = json.load(result)
+
+        self.assertEqual([27], result['keys'])
+        self.assertLess(result['elapsed'], 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import asyncio
+from typing import Callable, Dict
+
+from config import LARC_UI_BANNER_DURATION, LARC_UI_BANNER_REPEAT_INTERVAL
+
+
+class Banner:
+
+    def __init__(
+            self,
+            on_change: Callable[[], None],
+            duration: float = LARC_UI_BANNER_DURATION,
+            repeat_interval: float = LARC_UI_BANNER_REPEAT_INTERVAL,
+    ):
+        self._on_change = on_change
+        self._duration = duration
+        self._repeat_interval = repeat_interval
+        self._message: str = None
+        self._repeats = 0
+        self._expire_handle: asyncio.TimerHandle = None
+        self._last_shown: Dict[str, float] = {}
+
+    @property
+    def text(self) -> str:
+        if self._message is None:
+            return ''
+        if self._repeats > 1:
+            return f'{self._message} (x{self._repeats})'
+        return self._message
+
+    def show(self, message: str) -> bool:
+        loop = asyncio.get_event_loop()
+        now = loop.time()
+
+        if message == self._message:
+            # the same error while it is still visible only bumps the counter and the expiry
+            self._repeats += 1
+            self._schedule_expire(loop)
+            self._on_change()
+            return False
+
+        self._last_shown = {k: v for k, v in self._last_shown.items() if now - v < self._repeat_interval}
+        if message in self._last_shown:
+            return False
+
+        self._message = message
+        self._repeats = 1
+        self._last_shown[message] = now
+        self._schedule_expire(loop)
+        self._on_change()
+        return True
+
+    def clear(self) -> None:
+        if self._expire_handle is not None:
+            self._expire_handle.cancel()
+            self._expire_handle = None
+        if self._message is not None:
+            self._message = None
+            self._repeats = 0
+            self._on_change()
+
+    def _schedule_expire(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._expire_handle is not None:
+            self._expire_handle.cancel()
+        self._expire_handle = loop.call_later(self._duration, self.clear)
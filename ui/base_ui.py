@@ -1,53 +1,113 @@
 import abc
 import asyncio
 import curses
+import sys
+from typing import List, Callable
 
 from context.larc_context import LarcContext
+from ui.banner import Banner
+from ui.panel import Panel
+from ui.render_scheduler import RenderScheduler
 
 
 class BaseUI(abc.ABC):
 
-    def __init__(self, screen):
+    def __init__(self, screen, error_line: int = 4, input_line: int = None, context: LarcContext = None):
         self._screen = screen
         self._num_rows, self._num_cols = screen.getmaxyx()
-        self._window = curses.newwin(self._num_rows, self._num_cols, 0, 0)
-        self._window.nodelay(True)
         self._num_cols -= 1
         self._num_rows -= 1
-        self._context = LarcContext.instance()
+        self._context = context or LarcContext.instance()
         self._header_line = 3
-        self._error_line = 4
+        self._error_line = error_line
+        self._input_line = self._num_rows if input_line is None else input_line
+
+        self._panels: List[Panel] = []
+        self._header_panel = self._add_panel(0, 0, self._header_line, self._num_cols, self._print_header)
+        self._error_panel = self._add_panel(self._error_line, 2, 1, self._num_cols - 2, self._print_error_message)
+        self._input_panel = self._add_panel(self._input_line, 2, 1, self._num_cols - 2, self._print_input)
+        self._input_panel.window.nodelay(True)
+        self._input_panel.window.keypad(True)
+        self._render_scheduler = RenderScheduler(self._construct)
+        self._banner = Banner(on_change=lambda: self._invalidate(self._error_panel))
+        self._keys: asyncio.Queue = asyncio.Queue()
+        self._keys_reader: bool = None
+
+    @property
+    def render_scheduler(self) -> RenderScheduler:
+        return self._render_scheduler
 
     @abc.abstractmethod
     def show(self):
         pass
 
-    def _print_header(self):
-        self._window.attron(curses.color_pair(2))
-        self._window.attron(curses.A_BOLD)
+    def _add_panel(self, line: int, col: int, height: int, width: int, draw: Callable) -> Panel:
+        panel = Panel(self._screen, line, col, height, width, draw)
+        self._panels.append(panel)
+        return panel
 
-        self._window.addstr(1, 2, '              LABORATÓRIO 5 - REDES - FURB 2021/2')
-        self._window.addstr(2, 2, 'ARIEL ADONAI SOUZA, JEFERSON BONECHER E RAFAEL FROESCHLIN FILHO')
+    def _invalidate(self, *panels: Panel):
+        for panel in panels:
+            panel.invalidate()
+        self._render_scheduler.invalidate()
 
-        self._window.attroff(curses.color_pair(2))
-        self._window.attroff(curses.A_BOLD)
+    async def _construct(self):
+        self._render()
 
-    def _print_error(self, param):
-        self._window.attron(curses.A_BOLD)
-        self._window.attron(curses.color_pair(2))
+    def _render(self):
+        for panel in self._panels:
+            panel.render()
+        # the input panel is always flushed last so the terminal cursor ends up on it
+        self._input_panel.refresh_cursor()
+        curses.doupdate()
 
-        self._window.addstr(self._error_line, 2, f'{param}')
+    def _print_header(self, window):
+        window.attron(curses.color_pair(2))
+        window.attron(curses.A_BOLD)
 
-        self._window.attroff(curses.A_BOLD)
-        self._window.attron(curses.color_pair(2))
+        window.addstr(1, 2, '              LABORATÓRIO 5 - REDES - FURB 2021/2')
+        window.addstr(2, 2, 'ARIEL ADONAI SOUZA, JEFERSON BONECHER E RAFAEL FROESCHLIN FILHO')
 
-        self._window.refresh()
+        window.attroff(curses.color_pair(2))
+        window.attroff(curses.A_BOLD)
 
-        curses.napms(1000)
+    def _print_input(self, window):
+        pass
+
+    def _print_error_message(self, window):
+        text = self._banner.text
+        if text:
+            window.attron(curses.A_BOLD)
+            window.attron(curses.color_pair(2))
+            window.addstr(0, 0, text)
+
+    def _print_error(self, param):
+        self._banner.show(f'{param}')
 
     async def _read_key(self):
+        if self._keys_reader is None:
+            self._keys_reader = self._add_keys_reader()
+
+        if self._keys_reader:
+            return await self._keys.get()
+
         key = -1
         while key == -1:
-            key = self._window.getch()
+            key = self._input_panel.window.getch()
             await asyncio.sleep(0.01)
         return key
+
+    def _add_keys_reader(self) -> bool:
+        try:
+            asyncio.get_running_loop().add_reader(sys.stdin.fileno(), self._drain_keys)
+            return True
+        except (NotImplementedError, ValueError, OSError):
+            # event loops without add_reader support (e.g. Windows proactor) keep polling getch
+            return False
+
+    def _drain_keys(self):
+        # escape sequences and pastes arrive together, so everything is drained on a single wakeup
+        key = self._input_panel.window.getch()
+        while key != -1:
+            self._keys.put_nowait(key)
+            key = self._input_panel.window.getch()
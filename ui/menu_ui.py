@@ -2,8 +2,10 @@ import curses
 import enum
 import sys
 
+from config import LARC_UI_ESC_DELAY
 from connection.larc_messages import LarcGetCard, LarcQuitGame, LarcEnterGame, LarcStopGame, LarcSendMessage
-from context.larc_context import LarcContextEvent, LarcContextEventType
+from context.larc_context import LarcContext, LarcContextEvent, LarcContextEventType
+from exception.larc_exceptions import LarcTimeout
 from model.larc_models import LarcPlayerStatus, LarcCardSuit, LarcReceivedMessage, LarcCard, LarcSentMessage
 from ui.base_ui import BaseUI
 
@@ -22,8 +24,10 @@ class GameState(enum.Enum):
 
 class MenuUI(BaseUI):
 
-    def __init__(self):
+    def __init__(self, context: LarcContext = None):
         screen = curses.initscr()
+        # keys are read on the event loop, the ncurses default of a whole second would freeze it on every ESC
+        curses.set_escdelay(LARC_UI_ESC_DELAY)
         screen.keypad(True)
         screen.nodelay(True)
         curses.noecho()
@@ -32,25 +36,44 @@ class MenuUI(BaseUI):
         curses.init_pair(2, curses.COLOR_RED, curses.COLOR_BLACK)
         curses.init_pair(3, curses.COLOR_BLUE, curses.COLOR_BLACK)
         curses.init_pair(4, curses.COLOR_WHITE, curses.COLOR_BLACK)
-        super(MenuUI, self).__init__(screen=screen)
-
-        self._context.add_listener(self._on_event)
-
         self._users_line = 4
         self._message_line = 20
-        self._error_line = 20
         self._controls_line = 22
+        super(MenuUI, self).__init__(screen=screen, error_line=21, input_line=self._message_line, context=context)
+
         self._state = UIState.NONE
         self._game_state = GameState.NOT_PLAYING
         self._selected_user_id: int = None
         self._text_field = ''
+        self._messages_scroll = 0
+        self._message_lines = dict()
+
+        panels_height = self._message_line - self._users_line
+        self._users_panel = self._add_panel(self._users_line, 2, panels_height, 40, self._print_users)
+        self._players_panel = self._add_panel(self._users_line, 44, panels_height, 41, self._print_players)
+        self._cards_panel = self._add_panel(self._users_line, 87, panels_height, 41, self._print_cards)
+        self._messages_panel = self._add_panel(self._users_line, 130, panels_height, 101, self._print_messages)
+        for col in (42, 85, 128):
+            self._add_panel(self._users_line, col, 15, 1, self._print_line_users_players)
+        self._controls_panel = self._add_panel(self._controls_line, 2, 1, self._num_cols - 2, self._print_controls)
+
+        self._context.add_listener(self._on_event, event_types=(
+            LarcContextEventType.USERS,
+            LarcContextEventType.PLAYERS,
+            LarcContextEventType.CARDS,
+            LarcContextEventType.ERROR,
+        ))
+        self._context.add_listener(self._on_new_message, event_types=(LarcContextEventType.NEW_MESSAGE,))
 
     async def show(self):
+        self._render_scheduler.start()
+        self._invalidate()
         while True:
-            await self._construct()
-
             key = await self._read_key()
-            if self._state == UIState.NONE:
+            if key in (curses.KEY_PPAGE, curses.KEY_NPAGE):
+                self._scroll_messages(key)
+
+            elif self._state == UIState.NONE:
                 await self._process_key_none(key)
 
             elif self._state == UIState.SELECT_USER:
@@ -59,6 +82,8 @@ class MenuUI(BaseUI):
             elif self._state == UIState.MESSAGE:
                 await self._process_key_message(key)
 
+            self._invalidate(self._controls_panel, self._input_panel)
+
     async def _process_key_none(self, key):
         if key == 27:
             if self._game_state == GameState.NOT_PLAYING:
@@ -103,6 +128,7 @@ class MenuUI(BaseUI):
         if key == 27:
             self._state = UIState.SELECT_USER
             self._selected_user_id = None
+            self._invalidate(self._users_panel)
 
         elif key == 127 and len(self._text_field) > 0:  # BACKSPACE
             self._text_field = self._text_field[:-1]
@@ -121,6 +147,7 @@ class MenuUI(BaseUI):
         else:
             self._selected_user_id = user_id
             self._text_field = ''
+            self._invalidate(self._users_panel)
             self._state = UIState.MESSAGE
 
     async def _send_message(self):
@@ -139,154 +166,156 @@ class MenuUI(BaseUI):
         self._text_field = ''
 
     async def _construct(self):
-        self._window.clear()
-        try:
-            self._print_header()
-
-            self._print_users()
-            self._print_players()
-            self._print_line_users_players()
-            self._print_cards()
-            self._print_messages()
-            self._print_controls()
-            self._print_text_field()
-
-            if self._context.error:
-                self._print_error(self._context.error)
-                await self._context.set_error(None)
-
-            self._window.refresh()
-        except:
-            pass
-
-    def _print_users(self):
-        idx = self._users_line
-
-        self._window.attron(curses.color_pair(1))
-        self._window.attron(curses.A_BOLD)
-        self._window.addstr(idx, 2, 'USUÁRIOS CONECTADOS:         (VITÓRIAS)')
+        if self._context.error:
+            self._print_error(self._context.error)
+            await self._context.set_error(None)
+
+        self._render()
+
+    def _print_users(self, window):
+        idx = 0
+
+        window.attron(curses.color_pair(1))
+        window.attron(curses.A_BOLD)
+        window.addstr(idx, 0, 'USUÁRIOS CONECTADOS:         (VITÓRIAS)')
         idx += 2
 
-        self._window.attroff(curses.A_BOLD)
-        self._window.attron(curses.color_pair(3))
+        window.attroff(curses.A_BOLD)
+        window.attron(curses.color_pair(3))
 
-        for user in self._context.users:
+        for user in self._context.iter_users():
             if self._selected_user_id == user.id_:
-                self._window.attron(curses.color_pair(4))
+                window.attron(curses.color_pair(4))
             else:
-                self._window.attron(curses.color_pair(3))
+                window.attron(curses.color_pair(3))
 
             user_column = user.name
             while len(user_column) < 35:
                 user_column = f'{user_column} '
-            self._window.addstr(idx, 2, f'{user.id_} - {user_column}'[:35] + f'  {user.victories}'[:5])
+            window.addstr(idx, 0, f'{user.id_} - {user_column}'[:35] + f'  {user.victories}'[:5])
             idx += 1
 
-    def _print_players(self):
-        idx = self._users_line
+    def _print_players(self, window):
+        idx = 0
 
-        self._window.attron(curses.color_pair(1))
-        self._window.attron(curses.A_BOLD)
-        self._window.addstr(idx, 44, 'JOGADORES CONECTADOS:')
+        window.attron(curses.color_pair(1))
+        window.attron(curses.A_BOLD)
+        window.addstr(idx, 0, 'JOGADORES CONECTADOS:')
         idx += 2
 
-        self._window.attroff(curses.A_BOLD)
-        self._window.attron(curses.color_pair(3))
+        window.attroff(curses.A_BOLD)
+        window.attron(curses.color_pair(3))
 
-        for player in self._context.players:
+        for player in self._context.iter_players():
             user = self._context.get_user_by_id(player.user_id)
             status = self._translate_status(player.status)
             if user:
-                self._window.addstr(idx, 44, f'{user.id_} - {user.name}: {status}'[:40])
+                window.addstr(idx, 0, f'{user.id_} - {user.name}: {status}'[:40])
             else:
-                self._window.addstr(idx, 44, f'{player.user_id} - DESCONHECIDO: {status}'[:40])
+                window.addstr(idx, 0, f'{player.user_id} - DESCONHECIDO: {status}'[:40])
             idx += 1
 
-    def _print_cards(self):
-        idx = self._users_line
+    def _print_cards(self, window):
+        idx = 0
 
-        self._window.attron(curses.color_pair(1))
-        self._window.attron(curses.A_BOLD)
-        self._window.addstr(idx, 87, 'CARTAS:')
+        window.attron(curses.color_pair(1))
+        window.attron(curses.A_BOLD)
+        window.addstr(idx, 0, 'CARTAS:')
         idx += 2
 
-        self._window.attroff(curses.A_BOLD)
-        self._window.attron(curses.color_pair(3))
+        window.attroff(curses.A_BOLD)
+        window.attron(curses.color_pair(3))
         for card in self._context.cards:
             suit = self._translate_suit(card.suit)
-            self._window.addstr(idx, 87, f'{card.value} - {suit}'[:40])
+            window.addstr(idx, 0, f'{card.value} - {suit}'[:40])
             idx += 1
 
-    def _print_messages(self):
-        idx = self._users_line
+    def _print_messages(self, window):
+        idx = 0
 
-        self._window.attron(curses.color_pair(1))
-        self._window.attron(curses.A_BOLD)
-        self._window.addstr(idx, 130, 'MESSAGES:')
+        window.attron(curses.color_pair(1))
+        window.attron(curses.A_BOLD)
+        window.addstr(idx, 0, 'MESSAGES:' if self._messages_scroll == 0 else f'MESSAGES: (+{self._messages_scroll})')
         idx += 2
 
-        self._window.attroff(curses.A_BOLD)
-        self._window.attron(curses.color_pair(3))
-        for message in self._context.messages:
-            name = 'DESCONHECIDO'
-            if message.user_id == 0:
-                name = 'SERVIDOR'
-            else:
-                user = self._context.get_user_by_id(message.user_id)
-                if user:
-                    name = user.name
-            received = isinstance(message, LarcReceivedMessage)
-            text = f'{"<--" if received else "-->"} {message.user_id} - {name}: {message.data}'[:100]
-            self._window.addstr(idx, 130, text)
+        window.attroff(curses.A_BOLD)
+        window.attron(curses.color_pair(3))
+
+        # only the visible window is formatted, whatever the size of the history
+        lines = dict()
+        for message in self._context.message_history.tail(self._messages_rows(), offset=self._messages_scroll):
+            text = self._message_lines.get(message)
+            if text is None:
+                text = self._format_message(message)
+            lines[message] = text
+            window.addstr(idx, 0, text)
             idx += 1
+        self._message_lines = lines
 
-    def _print_line_users_players(self):
-        idx = self._users_line
+    def _format_message(self, message) -> str:
+        name = 'DESCONHECIDO'
+        if message.user_id == 0:
+            name = 'SERVIDOR'
+        else:
+            user = self._context.get_user_by_id(message.user_id)
+            if user:
+                name = user.name
+        received = isinstance(message, LarcReceivedMessage)
+        return f'{"<--" if received else "-->"} {message.user_id} - {name}: {message.data}'[:100]
+
+    def _messages_rows(self) -> int:
+        return max(0, self._messages_panel.height - 2)
+
+    def _scroll_messages(self, key):
+        rows = self._messages_rows()
+        max_scroll = max(0, len(self._context.message_history) - rows)
+        if key == curses.KEY_PPAGE:
+            self._messages_scroll = min(max_scroll, self._messages_scroll + rows)
+        else:
+            self._messages_scroll = max(0, self._messages_scroll - rows)
+        self._invalidate(self._messages_panel)
 
-        self._window.attron(curses.color_pair(1))
-        self._window.attron(curses.A_BOLD)
-        for i in range(0, 15):
-            self._window.addstr(idx + i, 42, '|')
-            self._window.addstr(idx + i, 85, '|')
-            self._window.addstr(idx + i, 128, '|')
+    def _print_line_users_players(self, window):
+        window.attron(curses.color_pair(1))
+        window.attron(curses.A_BOLD)
+        window.vline(0, 0, '|', 15)
 
-    def _print_controls(self):
-        idx = self._controls_line
+    def _print_controls(self, window):
+        idx = 0
 
+        window.attron(curses.color_pair(3))
         if self._state == UIState.NONE:
             if self._game_state == GameState.NOT_PLAYING:
-                self._window.addstr(idx, 2, f'ESC - SAIR | M - ENVIAR MENSAGEM | E - ENTRAR ')
+                window.addstr(idx, 0, f'ESC - SAIR | M - ENVIAR MENSAGEM | E - ENTRAR ')
 
             elif self._game_state == GameState.STOPPED:
-                self._window.addstr(idx, 2, f'ESC - SAIR | M - ENVIAR MENSAGEM | E - VOLTAR PARA O JOGO')
+                window.addstr(idx, 0, f'ESC - SAIR | M - ENVIAR MENSAGEM | E - VOLTAR PARA O JOGO')
 
             elif self._game_state == GameState.PLAYING:
-                self._window.addstr(idx, 2, f'ESC - SAIR | M - ENVIAR MENSAGEM | R - REQUISITAR CARTA | P - PARAR | C - LIMPAR CARTAS')
+                window.addstr(idx, 0, f'ESC - SAIR | M - ENVIAR MENSAGEM | R - REQUISITAR CARTA | P - PARAR | C - LIMPAR CARTAS')
 
         elif self._state == UIState.SELECT_USER:
-            self._window.addstr(idx, 2, f'ESC - VOLTAR | ENTER - SELECIONAR USUÁRIO')
+            window.addstr(idx, 0, f'ESC - VOLTAR | ENTER - SELECIONAR USUÁRIO')
 
         elif self._state == UIState.MESSAGE:
-            self._window.addstr(idx, 2, f'ESC - DESSELECIONAR | ENTER - ENVIAR MENSAGEM')
+            window.addstr(idx, 0, f'ESC - DESSELECIONAR | ENTER - ENVIAR MENSAGEM')
 
-    def _print_text_field(self):
+    def _print_input(self, window):
         text = ''
         if self._state == UIState.SELECT_USER:
             text = f'CÓDIGO DO USUÁRIO: '
         elif self._state == UIState.MESSAGE:
             text = f'MENSAGEM: '
 
-        idx = self._message_line
+        window.attron(curses.color_pair(1))
+        window.attron(curses.A_BOLD)
+        window.addstr(0, 0, text)
 
-        self._window.attron(curses.color_pair(1))
-        self._window.attron(curses.A_BOLD)
-        self._window.addstr(idx, 2, text)
+        window.attron(curses.color_pair(3))
+        window.attroff(curses.A_BOLD)
+        window.addstr(0, len(text), self._text_field)
 
-        self._window.attron(curses.color_pair(3))
-        self._window.attroff(curses.A_BOLD)
-        self._window.addstr(idx, 2 + len(text), self._text_field)
-
-        self._window.move(idx, len(text) + len(self._text_field) + 2)
+        window.move(0, len(text) + len(self._text_field))
 
     def _print_error(self, param):
         super(MenuUI, self)._print_error(f'ERRO: {param}')
@@ -313,9 +342,23 @@ class MenuUI(BaseUI):
             return 'ESPADAS'
         return 'DESCONHECIDO'
 
+    def _panels_for(self, type_: LarcContextEventType):
+        if type_ == LarcContextEventType.USERS:
+            # players and messages are printed with the user names
+            return self._users_panel, self._players_panel, self._messages_panel
+        elif type_ == LarcContextEventType.PLAYERS:
+            return self._players_panel,
+        elif type_ == LarcContextEventType.CARDS:
+            return self._cards_panel,
+        return ()
+
     async def _request_card(self):
         get_card = LarcGetCard(connection=self._context.connection, credentials=self._context.credentials)
-        card: LarcCard = await get_card.execute()
+        try:
+            card: LarcCard = await get_card.execute()
+        except LarcTimeout as e:
+            self._print_error(e)
+            return
         if card:
             await self._context.append_card(card)
 
@@ -338,10 +381,25 @@ class MenuUI(BaseUI):
         await self._context.clear_cards()
 
     async def _on_event(self, event: LarcContextEvent):
-        if event.type_ == LarcContextEventType.NEW_MESSAGE:
-            message: LarcReceivedMessage = event.data
+        events = event.data if event.type_ == LarcContextEventType.BATCH else [event]
+        for event_ in events:
+            self._invalidate(*self._panels_for(event_.type_))
+
+            if event_.type_ == LarcContextEventType.USERS:
+                # the cached message lines carry the user names
+                self._message_lines.clear()
+
+    async def _on_new_message(self, event: LarcContextEvent):
+        events = event.data if event.type_ == LarcContextEventType.BATCH else [event]
+        self._invalidate(self._messages_panel)
+        if self._messages_scroll > 0:
+            # keeps a scrolled view on the same messages while new ones arrive
+            max_scroll = max(0, len(self._context.message_history) - self._messages_rows())
+            self._messages_scroll = min(max_scroll, self._messages_scroll + len(events))
+
+        for event_ in events:
+            message: LarcReceivedMessage = event_.data
             if not message.empty \
                     and message.user_id == 0 \
                     and 'o vencedor desta rodada foi' in message.data.lower():
                 await self._clear_cards()
-        await self._construct()
@@ -0,0 +1,52 @@
+import curses
+from typing import Callable
+
+
+class Panel:
+
+    def __init__(self, screen, line: int, col: int, height: int, width: int, draw: Callable):
+        rows, cols = screen.getmaxyx()
+        line = max(0, min(line, rows - 1))
+        col = max(0, min(col, cols - 1))
+        self._height = max(1, min(height, rows - line))
+        self._width = max(1, min(width, cols - col))
+        self._window = curses.newwin(self._height, self._width, line, col)
+        self._draw = draw
+        self._dirty = True
+
+    @property
+    def window(self):
+        return self._window
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def invalidate(self) -> None:
+        self._dirty = True
+
+    def render(self) -> bool:
+        if not self._dirty:
+            return False
+
+        self._dirty = False
+        self._window.erase()
+        self._window.attrset(curses.A_NORMAL)
+        try:
+            self._draw(self._window)
+        except curses.error:
+            # text that does not fit in the panel is clipped
+            pass
+        self._window.noutrefresh()
+        return True
+
+    def refresh_cursor(self) -> None:
+        self._window.noutrefresh()
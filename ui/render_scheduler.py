@@ -0,0 +1,54 @@
+import asyncio
+from collections import deque
+from typing import Callable, Awaitable, Deque, List
+
+from config import LARC_UI_MAX_FPS
+
+
+class RenderScheduler:
+    _FRAME_TIMES_SIZE = 1000
+
+    def __init__(self, render: Callable[[], Awaitable], max_fps: float = LARC_UI_MAX_FPS):
+        self._render = render
+        self._frame_interval = 1 / max_fps if max_fps > 0 else 0.0
+        self._invalidated = asyncio.Event()
+        self._task: asyncio.Task = None
+        self._frames = 0
+        self._frame_times: Deque[float] = deque(maxlen=self._FRAME_TIMES_SIZE)
+
+    @property
+    def frames(self) -> int:
+        return self._frames
+
+    @property
+    def frame_times(self) -> List[float]:
+        return [*self._frame_times]
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_event_loop().create_task(self._loop())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def invalidate(self) -> None:
+        self._invalidated.set()
+
+    async def _loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._invalidated.wait()
+            # every invalidation up to this point is served by this frame
+            self._invalidated.clear()
+
+            started = loop.time()
+            try:
+                await self._render()
+            except Exception as e:
+                print(e)
+            self._frames += 1
+            self._frame_times.append(loop.time() - started)
+
+            await asyncio.sleep(max(0.0, self._frame_interval - (loop.time() - started)))